@@ -64,6 +64,55 @@ def create_sample_inventory():
     return df
 
 
+def create_sized_workbook(path, rows: int, cols: int, sheets: int = 1, seed: int = 0) -> Path:
+    """
+    指定サイズのサンプルワークブックを作成（ベンチマーク用）
+
+    1行目はヘッダー、データ行は 文字列・整数・小数・日付 の列を繰り返します。
+    大きなサイズでもメモリを使わないよう write_only モードで書き出します。
+
+    Args:
+        path: 保存先のパス
+        rows: シートあたりのデータ行数（ヘッダーを除く）
+        cols: 列数
+        sheets: シート数
+        seed: 乱数シード
+    """
+    import openpyxl
+
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    base_date = datetime(2024, 1, 1)
+    kinds = ('str', 'int', 'float', 'date')
+    words = ['東京', '大阪', '名古屋', '福岡', '札幌', '商品A', '商品B', '商品C']
+
+    for sheet_idx in range(1, sheets + 1):
+        ws = workbook.create_sheet(f'Sheet{sheet_idx}')
+        ws.append([f'{kinds[c % 4]}_{c + 1}' for c in range(cols)])
+
+        ints = rng.integers(0, 100000, size=(rows, cols)).tolist()
+        floats = rng.random((rows, cols)).round(4).tolist()
+        for r in range(rows):
+            row = []
+            for c in range(cols):
+                kind = kinds[c % 4]
+                if kind == 'str':
+                    row.append(words[ints[r][c] % len(words)])
+                elif kind == 'int':
+                    row.append(ints[r][c])
+                elif kind == 'float':
+                    row.append(floats[r][c] * 1000)
+                else:
+                    row.append(base_date + timedelta(days=ints[r][c] % 365))
+            ws.append(row)
+
+    workbook.save(path)
+    return path
+
+
 def main():
     """サンプルデータを作成してinputディレクトリに保存"""
     input_dir = Path('input')
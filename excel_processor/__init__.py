@@ -1,9 +1,10 @@
 """Excel Processor Library - 汎用的なExcel処理フレームワーク"""
 
 from .core import ExcelProcessor
-from .base_processor import BaseSheetProcessor
+from .base_processor import BaseSheetProcessor, CellVisitorProcessor, StreamingSheetProcessor
 from .utils import (
     load_excel_from_input,
+    peek_excel_from_input,
     get_excel_files,
     save_preview,
     print_sheet_info,
@@ -13,10 +14,22 @@ from .utils import (
 __all__ = [
     'ExcelProcessor',
     'BaseSheetProcessor',
+    'StreamingSheetProcessor',
+    'CellVisitorProcessor',
+    'DataFrameSheetProcessor',
     'load_excel_from_input',
+    'peek_excel_from_input',
     'get_excel_files',
     'save_preview',
     'print_sheet_info',
     'print_sheet_preview'
 ]
 __version__ = '0.1.0'
+
+
+def __getattr__(name: str):
+    # pandas の読み込みに時間がかかるため、DataFrameSheetProcessor は使われた時に import する
+    if name == 'DataFrameSheetProcessor':
+        from .dataframe_processor import DataFrameSheetProcessor
+        return DataFrameSheetProcessor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
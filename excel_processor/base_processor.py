@@ -1,11 +1,38 @@
 """ベースプロセッサー - ユーザーがカスタマイズ可能な処理インターフェース"""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import openpyxl
+from openpyxl.cell.cell import Cell
 from openpyxl.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
+from .output import OutputWriter
+from .passthrough import SheetPassthrough
+from .sheet_index import SheetIndex, SheetStats
+from .streamed_sheet import is_streamed
+from .tracing import NULL_SPAN, Tracer
+
+
+@dataclass
+class ProcessContext:
+    """ExcelProcessor が処理中のファイルごとにプロセッサーへ渡す実行コンテキスト"""
+
+    input_file: Path
+    output_dir: Path
+    tracer: Optional[Tracer] = None
+    # 解析を省略したシートの情報（全シートを読み込んだ場合は None）
+    passthrough: Optional[SheetPassthrough] = None
+    # プロセッサー間で共有するシート統計情報
+    sheet_index: Optional[SheetIndex] = None
+    # 出力ファイルの圧縮設定（プロセッサーが別のファイルを保存する場合も同じ設定を使う）
+    output: Optional[OutputWriter] = None
+    # プロセッサーが処理中のファイルとは別に保存したファイル（ジャーナルに記録される）
+    extra_outputs: List[Path] = field(default_factory=list)
+
 
 class BaseSheetProcessor(ABC):
     """
@@ -14,12 +41,20 @@ class BaseSheetProcessor(ABC):
     ユーザーはこのクラスを継承して、カスタム処理を実装します。
     """
 
+    # 処理内容のバージョン（処理ロジックを変更したら更新すると、古いキャッシュが使われなくなる）
+    version = "1"
+
+    # 同じ入力・同じ設定なら同じ結果になる場合 True（処理結果キャッシュの対象になる）
+    cacheable = True
+
     def __init__(self, config: Dict[str, Any] = None):
         """
         Args:
             config: プロセッサーの設定（YAML設定ファイルから読み込まれる）
         """
         self.config = config or {}
+        # ExcelProcessor から設定される実行コンテキスト（単体で使う場合は None）
+        self.context: Optional[ProcessContext] = None
 
     @abstractmethod
     def process(self, workbook: Workbook, file_path: str) -> Workbook:
@@ -35,6 +70,34 @@ class BaseSheetProcessor(ABC):
         """
         pass
 
+    def reads_sheets(self, sheetnames: List[str]) -> Optional[List[str]]:
+        """
+        処理中にセルの値や書式を参照する既存シートの名前
+
+        ExcelProcessor は、いずれのプロセッサーも読み書きしないシートを解析せず、
+        元ファイルの内容をそのまま出力へコピーします。
+        そのようなシートでも、使用範囲（max_row / max_column）は参照できます。
+
+        Args:
+            sheetnames: 入力ファイルのシート名
+
+        Returns:
+            シート名のリスト（None の場合は全シート）
+        """
+        return None
+
+    def writes_sheets(self, sheetnames: List[str]) -> Optional[List[str]]:
+        """
+        処理中に変更する既存シートの名前（新しく作成するシートも含めてよい）
+
+        Args:
+            sheetnames: 入力ファイルのシート名
+
+        Returns:
+            シート名のリスト（None の場合は全シート）
+        """
+        return None
+
     def create_sheet(self, workbook: Workbook, sheet_name: str, index: int = None) -> Worksheet:
         """
         新しいシートを作成するヘルパーメソッド
@@ -69,3 +132,185 @@ class BaseSheetProcessor(ABC):
     def log(self, message: str):
         """ログ出力用ヘルパーメソッド"""
         print(f"[{self.__class__.__name__}] {message}")
+
+    def sheet_stats(self, workbook: Workbook, sheet_name: str) -> SheetStats:
+        """
+        シートの統計情報（使用範囲・ヘッダー行・列ごとの型・件数・最小/最大/合計）を取得
+
+        ExcelProcessor から実行された場合は、ワークブックごとに1回だけ計算された結果を
+        他のプロセッサーと共有します。
+
+        Args:
+            workbook: Workbookオブジェクト
+            sheet_name: シート名
+
+        Returns:
+            SheetStatsオブジェクト
+        """
+        index = self.context.sheet_index if self.context else None
+        if index is None or index.workbook is not workbook:
+            index = SheetIndex(workbook)
+        return index.stats(sheet_name)
+
+    def span(self, stage: str, **attrs):
+        """
+        処理の一部をトレースの区間として計測するヘルパーメソッド
+
+        トレースが無効の場合は何もしません。
+
+        Args:
+            stage: 区間名（"<クラス名>:<stage>" として記録される）
+            attrs: 区間に付与する属性
+
+        Example:
+            with self.span("aggregate") as span:
+                ...
+                span.add_cells(row_count * column_count)
+        """
+        tracer = self.context.tracer if self.context else None
+        if tracer is None:
+            return nullcontext(NULL_SPAN)
+        return tracer.span(f"{self.__class__.__name__}:{stage}", **attrs)
+
+    def add_cells(self, count: int):
+        """現在のトレース区間に処理したセル数を加算"""
+        tracer = self.context.tracer if self.context else None
+        if tracer is not None and tracer.current is not None:
+            tracer.current.add_cells(count)
+
+
+class StreamingSheetProcessor(BaseSheetProcessor):
+    """
+    行単位でシートを処理するストリーミング用ベースクラス
+
+    ユーザーはこのクラスを継承して ``process_rows`` を実装します。
+    パイプラインがストリーミングプロセッサーのみで構成される場合、
+    ExcelProcessor は read_only モードで読み込み、write_only モードで書き出すため、
+    シートの行数に関係なくメモリ使用量が一定に保たれます。
+    """
+
+    @abstractmethod
+    def process_rows(
+        self,
+        rows: Iterator[Tuple[Any, ...]],
+        sheet_name: str,
+        file_path: str
+    ) -> Iterable[Tuple[Any, ...]]:
+        """
+        シートの行を受け取り、変換後の行を返すメインメソッド
+
+        Args:
+            rows: シートの行（セル値のタプル）のイテレーター
+            sheet_name: 処理中のシート名
+            file_path: 処理中のファイルパス（参照用）
+
+        Returns:
+            変換後の行のイテラブル（ジェネレーターを推奨）
+        """
+        pass
+
+    def process(self, workbook: Workbook, file_path: str) -> Workbook:
+        """
+        通常のWorkbookに対して ``process_rows`` を適用する
+
+        通常のプロセッサーと混在するパイプラインで使われます。
+        セルの書式は保持されず、値のみが書き戻されます。
+        """
+        for sheet_name in workbook.sheetnames:
+            ws = workbook[sheet_name]
+            rows = list(self.process_rows(ws.iter_rows(values_only=True), sheet_name, file_path))
+            if ws.max_row > 0:
+                ws.delete_rows(1, ws.max_row)
+            for row in rows:
+                ws.append(row)
+        return workbook
+
+
+class CellVisitorProcessor(BaseSheetProcessor):
+    """
+    セル単位の処理を行うビジター形式のベースクラス
+
+    ユーザーはこのクラスを継承して ``visit_cell``（または行単位の ``visit_row``）を実装します。
+    ExcelProcessor は連続する CellVisitorProcessor をまとめ、シートごとに1回の
+    ``iter_rows`` で全プロセッサーの処理を行います（N個のプロセッサーでもセルの走査は1回）。
+
+    走査範囲は各シートの処理開始時点の使用範囲（1行1列目から max_row × max_column）です。
+    """
+
+    def begin_workbook(self, workbook: Workbook, file_path: str):
+        """ワークブックの走査開始前に呼ばれる"""
+        pass
+
+    def accepts_sheet(self, ws: Worksheet) -> bool:
+        """このシートを処理するかどうか（False の場合は以降のメソッドが呼ばれない）"""
+        return True
+
+    def begin_sheet(self, ws: Worksheet):
+        """シートの走査開始前に呼ばれる"""
+        pass
+
+    def visit_row(self, row: Tuple[Cell, ...]):
+        """1行分のセルを処理（デフォルトでは各セルに visit_cell を呼ぶ）"""
+        for cell in row:
+            self.visit_cell(cell)
+
+    def visit_cell(self, cell: Cell):
+        """1セルを処理"""
+        pass
+
+    def end_sheet(self, ws: Worksheet):
+        """シートの走査完了後に呼ばれる"""
+        pass
+
+    def end_workbook(self, workbook: Workbook):
+        """全シートの走査完了後に呼ばれる"""
+        pass
+
+    def process(self, workbook: Workbook, file_path: str) -> Workbook:
+        """単体で実行する場合も、まとめて実行する場合と同じ順序で各メソッドを呼ぶ"""
+        return run_cell_visitors([self], workbook, file_path)
+
+
+def run_cell_visitors(
+    visitors: List[CellVisitorProcessor],
+    workbook: Workbook,
+    file_path: str
+) -> Workbook:
+    """
+    複数の CellVisitorProcessor を、シートごとに1回の走査でまとめて実行
+
+    Args:
+        visitors: 実行するプロセッサー（この順序で各セルが処理される）
+        workbook: 処理対象のWorkbook
+        file_path: 処理中のファイルパス（参照用）
+
+    Returns:
+        処理済みのWorkbookオブジェクト
+    """
+    for visitor in visitors:
+        visitor.begin_workbook(workbook, file_path)
+
+    for sheet_name in workbook.sheetnames:
+        ws = workbook[sheet_name]
+        # 書き込み専用シートはセルを読み返せないため走査しない
+        if is_streamed(ws):
+            continue
+        active = [visitor for visitor in visitors if visitor.accepts_sheet(ws)]
+        if not active:
+            continue
+
+        for visitor in active:
+            visitor.begin_sheet(ws)
+
+        visit_rows = [visitor.visit_row for visitor in active]
+        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=ws.max_column):
+            for visit_row in visit_rows:
+                visit_row(row)
+
+        for visitor in active:
+            visitor.end_sheet(ws)
+
+    for visitor in visitors:
+        visitor.end_workbook(workbook)
+
+    return workbook
@@ -0,0 +1,132 @@
+"""処理結果のキャッシュ - 入力内容とプロセッサー構成が同じなら前回の出力を再利用"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+from .base_processor import BaseSheetProcessor
+from .output import atomic_output
+
+# キャッシュキーの形式を変えた場合に更新する
+CACHE_FORMAT_VERSION = 2
+
+
+class ResultCache:
+    """
+    コンテンツアドレス方式の処理結果キャッシュ
+
+    入力ファイルのバイト列・プロセッサー名と設定（順序込み）・プロセッサーのバージョン・
+    出力ファイルの圧縮方式からキーを計算し、処理済みファイルを ``<key><拡張子>`` として保存します。
+    合計サイズが上限を超えた場合は、最後に使われた時刻が古いものから削除します（LRU）。
+    """
+
+    def __init__(self, cache_dir: str = ".cache/excel_processor", max_size_mb: float = 1024):
+        """
+        Args:
+            cache_dir: キャッシュの保存先ディレクトリ
+            max_size_mb: キャッシュ全体の最大サイズ（MB）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(
+        self,
+        input_file: Path,
+        processors: List[BaseSheetProcessor],
+        compression: str = 'default'
+    ) -> Optional[str]:
+        """
+        キャッシュキーを計算
+
+        Args:
+            input_file: 入力ファイル
+            processors: 適用するプロセッサー（この順序で実行される）
+            compression: 出力ファイルの圧縮方式（OutputWriter.compression）
+
+        Returns:
+            キー文字列。キャッシュできないプロセッサーが含まれる場合は None
+        """
+        if not all(processor.cacheable for processor in processors):
+            return None
+
+        pipeline = [
+            {
+                'name': f"{processor.__class__.__module__}.{processor.__class__.__qualname__}",
+                'version': processor.version,
+                'config': processor.config,
+            }
+            for processor in processors
+        ]
+        header = json.dumps(
+            {
+                'format': CACHE_FORMAT_VERSION,
+                'file_name': input_file.name,
+                'processors': pipeline,
+                'compression': compression,
+            },
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False
+        )
+
+        digest = hashlib.sha256(header.encode('utf-8'))
+        with open(input_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def fetch(self, key: str, output_file: Path) -> bool:
+        """キャッシュがあれば output_file にコピーして True を返す"""
+        entry = self._entry_path(key, output_file.suffix)
+        # 中断しても出力先に書きかけのファイルが残らないように、一時ファイル経由で配置
+        try:
+            with atomic_output(output_file) as tmp_file:
+                shutil.copyfile(entry, tmp_file)
+        except FileNotFoundError:
+            return False
+
+        # 最終利用時刻を更新（LRU の順序に使用）
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def store(self, key: str, output_file: Path):
+        """処理済みファイルをキャッシュに保存し、上限を超えた分を削除"""
+        entry = self._entry_path(key, output_file.suffix)
+        # 並列実行中の他プロセスから書きかけのファイルが見えないように、一時ファイル経由で配置
+        tmp_file = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+        shutil.copyfile(output_file, tmp_file)
+        os.replace(tmp_file, entry)
+        self._evict()
+
+    def _entry_path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / f"{key}{suffix}"
+
+    def _evict(self):
+        """合計サイズが上限以下になるまで、古いエントリーから削除"""
+        entries = []
+        total = 0
+        for path in self.cache_dir.iterdir():
+            if path.name.startswith('.'):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
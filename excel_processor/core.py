@@ -1,11 +1,38 @@
+import cProfile
+import os
+import shutil
 import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 import openpyxl
+from openpyxl.workbook import Workbook
 from tqdm import tqdm
 
-from .base_processor import BaseSheetProcessor
+from .base_processor import (
+    BaseSheetProcessor,
+    CellVisitorProcessor,
+    ProcessContext,
+    StreamingSheetProcessor,
+    run_cell_visitors,
+)
+from .cache import ResultCache
+from .export import SheetExporter
+from .journal import FAILED, PENDING, PROCESSING, REMOVED, SAVED, RunJournal
+from .output import PARTIAL_OUTPUT_PATTERN, OutputWriter, atomic_output
+from .passthrough import SheetPassthrough
+from .peek import WorkbookPeek
+from .pipeline import StagedPipeline, pipeline_supported
+from .sharding import Shard, write_manifest
+from .sheet_index import SheetIndex
+from .streamed_sheet import discard_streamed_sheets, is_streamed
+from .tracing import NULL_SPAN, Tracer
 
 
 class ExcelProcessor:
@@ -14,33 +41,84 @@ class ExcelProcessor:
 
     inputディレクトリのExcelファイルを処理し、
     タイムスタンプ付きディレクトリにoutputとして保存します。
+    各ファイルの処理状態は出力ディレクトリのジャーナル（_journal.jsonl）に記録され、
+    中断した実行は ``resume_dir`` を指定して再開できます。
     """
 
     def __init__(
         self,
         input_dir: str = "input",
         output_dir: str = "output",
-        processors: List[BaseSheetProcessor] = None
+        processors: List[BaseSheetProcessor] = None,
+        workers: int = 1,
+        cache: Optional[ResultCache] = None,
+        tracing: Optional[Dict[str, Any]] = None,
+        sheet_passthrough: bool = True,
+        pipeline: Optional[Dict[str, Any]] = None,
+        output: Optional[OutputWriter] = None,
+        shard: Optional[Shard] = None,
+        file_list: Optional[List[str]] = None,
+        resume_dir: Optional[str] = None,
+        export: Optional[SheetExporter] = None
     ):
         """
         Args:
             input_dir: 入力ファイルのディレクトリ
             output_dir: 出力先のベースディレクトリ
             processors: 適用するプロセッサーのリスト
+            workers: 並列処理のプロセス数（1=逐次処理、0以下=CPUコア数）
+            cache: 処理結果キャッシュ（Noneの場合はキャッシュしない）
+            tracing: トレース設定（enabled, dir, memory, profile）
+            sheet_passthrough: どのプロセッサーも読み書きしないシートを解析せず、元ファイルからコピーするか
+            pipeline: ステージパイプライン設定（enabled, queue_size）
+            output: 出力ファイルの圧縮設定（Noneの場合は openpyxl と同じ deflate 圧縮）
+            shard: 担当するシャード（指定すると入力ファイルの一部だけを処理し、マニフェストを出力）
+            file_list: 処理するファイル名の一覧（Noneの場合は入力ディレクトリの全ファイル）
+            resume_dir: 再開する実行の出力ディレクトリ（保存済みのファイルを処理せずに続きから実行）
+            export: シートを列指向形式（CSV / Parquet / Arrow）でも書き出す設定（Noneの場合は書き出さない）
         """
         self.input_dir = Path(input_dir)
         self.output_base_dir = Path(output_dir)
         self.processors = processors or []
-        self.timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-        self.output_dir = self.output_base_dir / self.timestamp
+        self.workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        self.cache = cache
+        self.tracing = tracing or {}
+        self.sheet_passthrough = sheet_passthrough
+        self.pipeline = pipeline or {}
+        self.output = output or OutputWriter()
+        self.shard = shard
+        self.file_list = file_list
+        self.export = export
+        self.resume = resume_dir is not None
+        if self.resume:
+            self.output_dir = Path(resume_dir)
+            self.timestamp = self.output_dir.name
+        else:
+            self.timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+            self.output_dir = self.output_base_dir / self.timestamp
+
+    @property
+    def journal(self) -> RunJournal:
+        """現在の出力ディレクトリの実行ジャーナル"""
+        return RunJournal(self.output_dir)
 
     def run(self):
         """処理のメイン実行"""
         # 入力ファイルの検出
         excel_files = self._find_excel_files()
+        completed = self._resume_run(excel_files) if self.resume else []
+        if completed:
+            done = {input_file.name for input_file in completed}
+            excel_files = [input_file for input_file in excel_files if input_file.name not in done]
 
         if not excel_files:
-            print("No Excel files found in input directory.")
+            if completed:
+                print(f"All files in {self.output_dir} have already been processed.")
+            else:
+                print("No Excel files found in input directory.")
+            # 担当するファイルがないシャードも、まとめる時に揃っていることを確認できるようマニフェストを出力する
+            if self.shard is not None:
+                write_manifest(self.output_dir, self.shard, completed, [])
             return
 
         print(f"Found {len(excel_files)} Excel file(s) to process.")
@@ -48,19 +126,98 @@ class ExcelProcessor:
 
         # 出力ディレクトリを作成
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.journal.record_all((input_file.name for input_file in excel_files), PENDING)
+
+        # 各ファイルを処理（1ファイルの失敗は他のファイルに影響させない）
+        if self.workers > 1 and len(excel_files) > 1:
+            failures = self._run_parallel(excel_files)
+        elif self._use_pipeline(len(excel_files)):
+            failures = self._run_pipelined(excel_files)
+        else:
+            failures = self._run_sequential(excel_files)
+
+        if self.shard is not None:
+            processed = sorted(completed + excel_files, key=lambda f: f.name)
+            manifest_file = write_manifest(self.output_dir, self.shard, processed, failures)
+            print(f"Shard manifest: {manifest_file}")
+
+        if failures:
+            self._report_failures(failures, len(excel_files))
+            sys.exit(1)
+
+        print(f"\nAll files processed successfully!")
+        print(f"Output saved to: {self.output_dir}")
+
+    def _resume_run(self, excel_files: List[Path]) -> List[Path]:
+        """
+        中断した実行を再開する準備をし、前回までに処理が完了したファイルを返す
 
-        # 各ファイルを処理
+        保存済みで元ファイルが残っているファイルは、元ファイルを削除して完了にします。
+        処理中・処理待ち・失敗のファイルは、もう一度処理します。
+        """
+        journal = self.journal
+        if not journal.exists():
+            print(f"Error: No run journal found in '{self.output_dir}'; cannot resume.")
+            sys.exit(1)
+        journal.repair()
+
+        # 中断した時に書き込み中だった一時ファイルを削除
+        for partial_file in self.output_dir.rglob(PARTIAL_OUTPUT_PATTERN):
+            partial_file.unlink()
+
+        states = journal.states()
+        for input_file in excel_files:
+            state = states.get(input_file.name, {}).get('state')
+            if state == SAVED and (self.output_dir / input_file.name).exists():
+                input_file.unlink()
+                journal.record(input_file.name, REMOVED)
+                states[input_file.name]['state'] = REMOVED
+            elif state == REMOVED:
+                print(f"Warning: {input_file.name} was already processed in this run; leaving it in the input directory.")
+
+        completed = [self.input_dir / name for name, entry in states.items() if entry['state'] == REMOVED]
+        print(f"Resuming run: {self.output_dir} ({len(completed)} file(s) already processed)")
+        return completed
+
+    def _run_sequential(self, excel_files: List[Path]) -> List[Tuple[Path, BaseException]]:
+        """ファイルを1つずつ処理し、失敗したファイルの一覧を返す"""
+        failures = []
         for input_file in tqdm(excel_files, desc="Processing files"):
             try:
                 self._process_file(input_file)
             except Exception as e:
                 print(f"\nError processing {input_file}: {e}")
-                import traceback
                 traceback.print_exc()
-                sys.exit(1)
+                failures.append((input_file, e))
+        return failures
 
-        print(f"\nAll files processed successfully!")
-        print(f"Output saved to: {self.output_dir}")
+    def _run_parallel(self, excel_files: List[Path]) -> List[Tuple[Path, BaseException]]:
+        """プロセスプールでファイルを並列処理し、失敗したファイルの一覧を返す"""
+        workers = min(self.workers, len(excel_files))
+        print(f"Using {workers} worker processes.")
+
+        failures = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._process_file, input_file): input_file
+                for input_file in excel_files
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing files"):
+                input_file = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"\nError processing {input_file}: {e}")
+                    traceback.print_exception(e)
+                    failures.append((input_file, e))
+        return failures
+
+    def _report_failures(self, failures: List[Tuple[Path, BaseException]], total: int):
+        """失敗したファイルの一覧を出力"""
+        print(f"\n{len(failures)} of {total} file(s) failed:")
+        for input_file, error in sorted(failures, key=lambda item: item[0].name):
+            print(f"  - {input_file.name}: {error.__class__.__name__}: {error}")
+        print(f"Successful outputs saved to: {self.output_dir}")
 
     def _find_excel_files(self) -> List[Path]:
         """inputディレクトリからExcelファイルを検索"""
@@ -73,32 +230,465 @@ class ExcelProcessor:
         # 一時ファイルを除外
         excel_files = [f for f in excel_files if not f.name.startswith("~$")]
 
+        # ファイル一覧が指定されていれば、その中のファイルだけを処理する
+        if self.file_list is not None:
+            names = set(self.file_list)
+            missing = names - {f.name for f in excel_files}
+            if missing:
+                print(f"Warning: Files in file list not found: {', '.join(sorted(missing))}")
+            excel_files = [f for f in excel_files if f.name in names]
+
+        # シャードごとに担当するファイルを選ぶ（全シャードで同じ入力から同じ分割になるよう名前順に並べる）
+        excel_files.sort(key=lambda f: f.name)
+        if self.shard is not None:
+            total = len(excel_files)
+            excel_files = self.shard.select(excel_files)
+            print(f"Shard {self.shard.index}/{self.shard.count} ({self.shard.strategy}): "
+                  f"{len(excel_files)} of {total} file(s)")
+
         return excel_files
 
+    def _is_streaming_pipeline(self) -> bool:
+        """全プロセッサーがストリーミング対応かどうか"""
+        return bool(self.processors) and all(
+            isinstance(processor, StreamingSheetProcessor) for processor in self.processors
+        )
+
+    def _new_job(self, input_file: Path) -> "_FileJob":
+        """ファイルごとのトレーサーと実行コンテキストを作成"""
+        tracer = Tracer(self.tracing.get('memory', False), file=input_file.name) if self.tracing_enabled else None
+        context = ProcessContext(input_file=input_file, output_dir=self.output_dir, tracer=tracer, output=self.output)
+        return _FileJob(context=context, output_file=self.output_dir / input_file.name)
+
+    def _use_pipeline(self, file_count: int) -> bool:
+        """ステージパイプラインで処理するかどうか（ストリーミング処理・移動のみの場合は使わない）"""
+        return (
+            bool(self.pipeline.get('enabled', False))
+            and file_count > 1
+            and bool(self.processors)
+            and not self._is_streaming_pipeline()
+        )
+
     def _process_file(self, input_file: Path):
         """単一のExcelファイルを処理"""
         print(f"\nProcessing: {input_file.name}")
+        self.journal.record(input_file.name, PROCESSING)
+
+        try:
+            # 適用するプロセッサーがなければ、ファイルをそのまま移動
+            if not self.processors:
+                output_file = self.output_dir / input_file.name
+                try:
+                    # 同じファイルシステム内ならアトミックに移動できる
+                    os.replace(input_file, output_file)
+                except OSError:
+                    with atomic_output(output_file) as tmp_file:
+                        shutil.copy2(input_file, tmp_file)
+                    input_file.unlink()
+                self.journal.record(input_file.name, REMOVED)
+                print(f"Moved: {output_file.name}")
+                return
+
+            job = self._new_job(input_file)
+            try:
+                with job.span("file"):
+                    if not self._fetch_cached(job):
+                        if self._is_streaming_pipeline():
+                            self._process_file_streaming(job)
+                        else:
+                            self._load(job)
+                            self._process(job)
+                            self._save(job)
+                            self._export_sheets(job)
+                        self._record_saved(job)
+                        print(f"Saved: {job.output_file.name} ({job.save_summary})")
+                        self._store_cached(job)
+            finally:
+                if job.tracer is not None:
+                    self._export_trace(job)
+
+            self._remove_original(job)
+        except Exception as e:
+            self._record_failure(input_file, e)
+            raise
+
+    def _fetch_cached(self, job: "_FileJob") -> bool:
+        """キャッシュに処理結果があれば出力先へコピーし、True を返す"""
+        job.cache_key = (
+            self.cache.make_key(job.input_file, self.processors, self.output.compression) if self.cache else None
+        )
+        if job.cache_key is not None and self.cache.fetch(job.cache_key, job.output_file):
+            print(f"Cache hit: {job.output_file.name}")
+            self._export_saved(job)
+            self.journal.record(job.input_file.name, SAVED, cached=True)
+            return True
+        return False
+
+    def _store_cached(self, job: "_FileJob"):
+        if job.cache_key is not None:
+            self.cache.store(job.cache_key, job.output_file)
+
+    def _remove_original(self, job: "_FileJob"):
+        # 元のファイルを削除（処理済みファイルは既に保存済み）
+        job.input_file.unlink()
+        self.journal.record(job.input_file.name, REMOVED)
+        print(f"Removed original: {job.input_file.name}")
+
+    def _record_failure(self, input_file: Path, error: BaseException):
+        """失敗したファイルをジャーナルに記録（記録に失敗しても元の例外を優先する）"""
+        try:
+            self.journal.record(input_file.name, FAILED, error=f"{error.__class__.__name__}: {error}")
+        except OSError:
+            traceback.print_exc()
 
-        # Excelファイルを読み込み
-        workbook = openpyxl.load_workbook(input_file)
+    def _load(self, job: "_FileJob"):
+        """Excelファイルを読み込み（どのプロセッサーも読み書きしないシートは解析しない）"""
+        passthrough = SheetPassthrough(job.input_file, self.processors) if self.sheet_passthrough else None
+        with job.span("load") as span:
+            if passthrough is not None:
+                workbook = passthrough.load()
+                job.context.passthrough = passthrough
+            else:
+                workbook = openpyxl.load_workbook(job.input_file)
+            if job.tracer is not None:
+                span.add_cells(self._count_cells(workbook))
+                if passthrough is not None:
+                    span.attrs['passthrough_sheets'] = passthrough.sheets
 
-        # 各プロセッサーを適用
+        job.workbook = workbook
+        # シート統計情報は参照された時に計算し、全プロセッサーで共有する
+        job.context.sheet_index = SheetIndex(workbook, passthrough)
+
+    def _process(self, job: "_FileJob"):
+        """各プロセッサーを適用（連続する CellVisitorProcessor は1回のセル走査にまとめる）"""
         for processor in self.processors:
+            processor.context = job.context
+
+        for group in self._group_processors():
             try:
-                workbook = processor.process(workbook, str(input_file))
+                job.workbook = self._apply_processors(job, group)
             except Exception as e:
-                print(f"Error in processor {processor.__class__.__name__}: {e}")
+                names = "+".join(processor.__class__.__name__ for processor in group)
+                print(f"Error in processor {names}: {e}")
+                discard_streamed_sheets(job.workbook)
+                raise
+            self._invalidate_sheet_index(job, group)
+
+    def _save(self, job: "_FileJob"):
+        """処理済みファイルを保存"""
+        with job.span("save") as span:
+            if job.tracer is not None:
+                span.add_cells(self._count_cells(job.workbook))
+            start = time.perf_counter()
+            try:
+                with atomic_output(job.output_file) as tmp_file:
+                    if job.context.passthrough is not None:
+                        job.context.passthrough.save(job.workbook, tmp_file, self.output)
+                    else:
+                        self.output.save(job.workbook, tmp_file)
+            except Exception:
+                discard_streamed_sheets(job.workbook)
                 raise
+            self._record_save(job, span, time.perf_counter() - start)
+
+    def _process_file_streaming(self, job: "_FileJob"):
+        """read_only / write_only モードで行単位にExcelファイルを処理"""
+        for processor in self.processors:
+            processor.context = job.context
+
+        with job.span("load"):
+            source = openpyxl.load_workbook(job.input_file, read_only=True)
+        workbook = openpyxl.Workbook(write_only=True)
+
+        try:
+            for ws in source.worksheets:
+                with job.span(f"stream:{ws.title}") as span:
+                    rows = ws.iter_rows(values_only=True)
+                    # ジェネレーターを連結し、1行ずつ全プロセッサーを通す
+                    for processor in self.processors:
+                        rows = processor.process_rows(rows, ws.title, str(job.input_file))
+
+                    # 書き出し対象のシートは、保存する行をそのまま列指向形式でも書き出す
+                    if self.export is not None and self.export.wants(ws.title):
+                        rows = self.export.tee(rows, self._export_file(job, ws.title))
+
+                    output_ws = workbook.create_sheet(ws.title)
+                    cells = 0
+                    for row in rows:
+                        output_ws.append(row)
+                        cells += len(row)
+                    span.add_cells(cells)
+        finally:
+            source.close()
 
         # 処理済みファイルを保存
-        output_file = self.output_dir / input_file.name
-        workbook.save(output_file)
-        print(f"Saved: {output_file.name}")
+        with job.span("save") as span:
+            start = time.perf_counter()
+            with atomic_output(job.output_file) as tmp_file:
+                self.output.save(workbook, tmp_file)
+            self._record_save(job, span, time.perf_counter() - start)
 
-        # 元のファイルを削除（処理済みファイルは既に保存済み）
-        input_file.unlink()
-        print(f"Removed original: {input_file.name}")
+    def _export_file(self, job: "_FileJob", sheet_name: str) -> Path:
+        return self.export.export_file(self.output_dir, job.input_file, sheet_name)
+
+    def _export_sheets(self, job: "_FileJob"):
+        """処理済みのワークブックから、対象のシートを列指向形式で書き出す（保存したファイルは読み込み直さない）"""
+        if self.export is None:
+            return
+
+        passthrough = job.context.passthrough
+        peek = None
+        exported = []
+        try:
+            with job.span("export") as span:
+                for ws in job.workbook.worksheets:
+                    if not self.export.wants(ws.title):
+                        continue
+                    if is_streamed(ws):
+                        print(f"Skipped export of streamed sheet: {ws.title}")
+                        continue
+
+                    source_sheet = passthrough.source_sheet(ws) if passthrough is not None else None
+                    if source_sheet is not None:
+                        # 解析を省略したシートは入力ファイルと同じ内容なので、入力ファイルから行を読む
+                        peek = peek or WorkbookPeek(job.input_file)
+                        rows = peek.iter_rows(source_sheet, max_row=None)
+                    else:
+                        rows = ws.iter_rows(values_only=True)
+                    self.export.write(rows, self._export_file(job, ws.title))
+                    exported.append(ws.title)
+                if job.tracer is not None:
+                    span.attrs['sheets'] = exported
+                    span.attrs['format'] = self.export.format
+        finally:
+            if peek is not None:
+                peek.close()
+        if exported:
+            print(f"Exported: {len(exported)} sheet(s) as {self.export.format}")
+
+    def _export_saved(self, job: "_FileJob"):
+        """キャッシュから取得した出力ファイルのシートを書き出す（ワークブックは作らずに行を読む）"""
+        if self.export is None:
+            return
+
+        exported = []
+        with job.span("export"), WorkbookPeek(job.output_file) as peek:
+            for sheet in peek.sheets:
+                if self.export.wants(sheet.title) and not sheet.is_chartsheet:
+                    self.export.write(peek.iter_rows(sheet.title, max_row=None), self._export_file(job, sheet.title))
+                    exported.append(sheet.title)
+        if exported:
+            print(f"Exported: {len(exported)} sheet(s) as {self.export.format}")
+
+    def _record_save(self, job: "_FileJob", span, elapsed: float):
+        """書き出したバイト数と保存のスループットを記録"""
+        job.bytes_written = job.output_file.stat().st_size
+        job.save_sec = elapsed
+        if job.tracer is not None:
+            span.attrs['compression'] = self.output.compression
+            span.attrs['bytes_written'] = job.bytes_written
+            span.attrs['mb_per_sec'] = round(job.bytes_written / (1024 * 1024) / elapsed, 3) if elapsed > 0 else None
+
+    def _record_saved(self, job: "_FileJob"):
+        """出力ファイルと書き出しがすべて揃ったことをジャーナルに記録（再開時に元ファイルが削除される）"""
+        extra = [os.path.relpath(path, self.output_dir) for path in job.context.extra_outputs]
+        self.journal.record(
+            job.input_file.name, SAVED, bytes_written=job.bytes_written, **({'extra_outputs': extra} if extra else {})
+        )
+
+    def _run_pipelined(self, excel_files: List[Path]) -> List[Tuple[Path, BaseException]]:
+        """
+        読み込み・処理・保存をステージに分けて重ねて実行し、失敗したファイルの一覧を返す
+
+        ファイルN の処理中に、ファイルN+1 の読み込みとファイルN-1 の保存が進みます。
+        処理・保存は fork した子プロセスで行い、プロセッサーの処理は常に1ファイルずつ順番に行われます。
+        """
+        if not pipeline_supported():
+            print("Staged pipeline requires the 'fork' start method; processing sequentially.")
+            return self._run_sequential(excel_files)
+
+        queue_size = self.pipeline.get('queue_size', 2)
+        print(f"Using staged pipeline (queue size: {queue_size}).")
+
+        pipeline = StagedPipeline(
+            load=self._load_stage,
+            process=self._process,
+            save=self._save_stage,
+            complete=self._complete_stage,
+            skip=lambda job: job.error is not None or job.cached,
+            report=self._new_spans,
+            release=self._release_stage,
+            queue_size=queue_size
+        )
+        failures = []
+        for job in tqdm(pipeline.run(excel_files), total=len(excel_files), desc="Processing files"):
+            if job.error is not None:
+                print(f"\nError processing {job.input_file}: {job.error}")
+                traceback.print_exception(job.error)
+                failures.append((job.input_file, job.error))
+
+        print(pipeline.format_stats())
+        return failures
+
+    def _load_stage(self, input_file: Path) -> "_FileJob":
+        """読み込みステージ（親プロセス）"""
+        print(f"\nProcessing: {input_file.name}")
+        self.journal.record(input_file.name, PROCESSING)
+        job = self._new_job(input_file)
+        try:
+            job.cached = self._fetch_cached(job)
+            if not job.cached:
+                self._load(job)
+                # 子プロセスが記録したトレース区間だけを親プロセスへ送り返す
+                job.recorded_spans = len(job.tracer.spans) if job.tracer is not None else 0
+        except Exception as e:
+            job.error = e
+        return job
+
+    def _save_stage(self, job: "_FileJob"):
+        """保存ステージ（子プロセス）"""
+        self._save(job)
+        self._export_sheets(job)
+        self._record_saved(job)
+        print(f"Saved: {job.output_file.name} ({job.save_summary})")
+
+    def _release_stage(self, job: "_FileJob"):
+        """子プロセスの開始後（親プロセス）: 子プロセスへ引き継いだワークブックへの参照を解放"""
+        job.workbook = None
+        # シート統計情報・解析を省略したシートもワークブックを参照している
+        job.context.sheet_index = None
+        job.context.passthrough = None
+
+    def _new_spans(self, job: "_FileJob") -> list:
+        return job.tracer.spans[job.recorded_spans:] if job.tracer is not None else []
+
+    def _complete_stage(self, job: "_FileJob", error: Optional[BaseException], spans: Optional[list]):
+        """完了処理（親プロセス）: キャッシュへの保存・元ファイルの削除・トレースの出力"""
+        if job.tracer is not None and spans:
+            job.tracer.spans.extend(spans)
+        if error is not None:
+            job.error = error
+
+        try:
+            if job.error is None:
+                if not job.cached:
+                    self._store_cached(job)
+                self._remove_original(job)
+        except Exception as e:
+            job.error = e
+        finally:
+            if job.error is not None:
+                self._record_failure(job.input_file, job.error)
+            if job.tracer is not None:
+                self._export_trace(job)
+
+    def _group_processors(self) -> List[List[BaseSheetProcessor]]:
+        """プロセッサーを、連続する CellVisitorProcessor ごとにまとめたグループに分ける"""
+        groups = []
+        for processor in self.processors:
+            if (
+                isinstance(processor, CellVisitorProcessor)
+                and groups
+                and isinstance(groups[-1][-1], CellVisitorProcessor)
+            ):
+                groups[-1].append(processor)
+            else:
+                groups.append([processor])
+        return groups
+
+    def _invalidate_sheet_index(self, job: "_FileJob", group: List[BaseSheetProcessor]):
+        """プロセッサーが書き込みを宣言したシートの統計情報を破棄"""
+        index = job.context.sheet_index
+        if index.workbook is not job.workbook:
+            job.context.sheet_index = SheetIndex(job.workbook, job.context.passthrough)
+            return
+
+        for processor in group:
+            written = processor.writes_sheets(job.workbook.sheetnames)
+            index.invalidate(written)
+            if written is None:
+                return
+
+    def _apply_processors(self, job: "_FileJob", group: List[BaseSheetProcessor]):
+        """プロセッサーのグループを1つ適用（トレース・プロファイル付き）"""
+        name = "+".join(processor.__class__.__name__ for processor in group)
+        if len(group) == 1:
+            span_name = f"process:{name}"
+            run = group[0].process
+        else:
+            span_name = f"visit:{name}"
+            run = partial(run_cell_visitors, group)
+
+        file_path = str(job.input_file)
+        with job.span(span_name):
+            if not self.tracing.get('profile', False):
+                return run(job.workbook, file_path)
+
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(run, job.workbook, file_path)
+            finally:
+                profile_file = self._trace_dir / f"{job.input_file.stem}.{name}.prof"
+                profile_file.parent.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(profile_file)
+
+    @property
+    def tracing_enabled(self) -> bool:
+        return bool(self.tracing.get('enabled', False))
+
+    @property
+    def _trace_dir(self) -> Path:
+        trace_dir = self.tracing.get('dir')
+        return Path(trace_dir) if trace_dir else self.output_dir / "_trace"
+
+    def _export_trace(self, job: "_FileJob"):
+        """トレース結果を JSON Lines と Chrome トレース形式で出力"""
+        job.tracer.write_jsonl(self._trace_dir / f"{job.input_file.stem}.trace.jsonl")
+        job.tracer.write_chrome_trace(self._trace_dir / f"{job.input_file.stem}.trace.json")
+
+    @staticmethod
+    def _count_cells(workbook) -> int:
+        """ワークブックの使用範囲のセル数"""
+        return sum(ws.max_row * ws.max_column for ws in workbook.worksheets)
 
     def add_processor(self, processor: BaseSheetProcessor):
         """プロセッサーを追加"""
         self.processors.append(processor)
+
+
+@dataclass
+class _FileJob:
+    """1ファイル分の処理状態（パイプラインモードではステージ間で受け渡す）"""
+
+    context: ProcessContext
+    output_file: Path
+    workbook: Optional[Workbook] = None
+    cache_key: Optional[str] = None
+    cached: bool = False
+    error: Optional[BaseException] = None
+    recorded_spans: int = 0
+    bytes_written: Optional[int] = None
+    save_sec: float = 0.0
+
+    @property
+    def save_summary(self) -> str:
+        """書き出したサイズと保存のスループット（例: "12.3 MB in 1.20s, 10.3 MB/s"）"""
+        if self.bytes_written is None:
+            return ""
+        size_mb = self.bytes_written / (1024 * 1024)
+        rate = f", {size_mb / self.save_sec:.1f} MB/s" if self.save_sec > 0 else ""
+        return f"{size_mb:.1f} MB in {self.save_sec:.2f}s{rate}"
+
+    @property
+    def input_file(self) -> Path:
+        return self.context.input_file
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        return self.context.tracer
+
+    def span(self, name: str, **attrs):
+        """トレース区間（トレース無効時は何もしない）"""
+        if self.tracer is None:
+            return nullcontext(NULL_SPAN)
+        return self.tracer.span(name, **attrs)
@@ -0,0 +1,169 @@
+"""DataFrameプロセッサー - シートを pandas の DataFrame としてまとめて処理するベースクラス"""
+
+from abc import abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import openpyxl
+import pandas as pd
+from openpyxl.workbook import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+from .base_processor import BaseSheetProcessor
+
+
+class DataFrameSheetProcessor(BaseSheetProcessor):
+    """
+    シートを pandas の DataFrame として受け取り、ベクトル演算で処理するベースクラス
+
+    ユーザーはこのクラスを継承して ``process_frames`` を実装します。
+    対象シートは値のみをまとめて読み込んで DataFrame に変換し、
+    戻り値の DataFrame は行単位の一括追加でシートへ書き戻します。
+
+    他のプロセッサーが読み書きしないシートは、ワークブックのセルを作らずに
+    入力ファイルから read_only モードで直接読み込みます。
+
+    共通の設定:
+        sheets: ["売上"]  # DataFrame として受け取るシート（省略時は全シート）
+        header: true  # 1行目を列名として扱うか
+    """
+
+    @abstractmethod
+    def process_frames(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        file_path: str
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        シートの DataFrame を受け取り、書き出す DataFrame を返すメインメソッド
+
+        Args:
+            frames: シート名 -> DataFrame（設定の ``sheets`` の順）
+            file_path: 処理中のファイルパス（参照用）
+
+        Returns:
+            シート名 -> 書き出す DataFrame（既存のシートは置き換え、存在しないシートは末尾に追加）。
+            書き出すものがなければ None
+        """
+        pass
+
+    def reads_sheets(self, sheetnames: List[str]) -> Optional[List[str]]:
+        # 対象シートは値のみを読み込むため、解析済みのセルは必要ない
+        return []
+
+    def writes_sheets(self, sheetnames: List[str]) -> Optional[List[str]]:
+        # 書き戻すシートは作り直すため、元のシートの解析は必要ない
+        return []
+
+    def process(self, workbook: Workbook, file_path: str) -> Workbook:
+        sheet_names = self.target_sheets(workbook.sheetnames)
+
+        with self.span("read_frames") as span:
+            frames = self.read_frames(workbook, sheet_names)
+            span.add_cells(sum(frame.size for frame in frames.values()))
+
+        results = self.process_frames(frames, file_path) or {}
+
+        with self.span("write_frames") as span:
+            for sheet_name, frame in results.items():
+                self.write_frame(workbook, sheet_name, frame)
+                span.add_cells(frame.size)
+
+        return workbook
+
+    def target_sheets(self, sheetnames: List[str]) -> List[str]:
+        """DataFrame として受け取るシート名（存在しないシートは警告して除外）"""
+        sheets = self.config.get('sheets')
+        if sheets is None:
+            return list(sheetnames)
+
+        missing = [name for name in sheets if name not in sheetnames]
+        if missing:
+            self.log(f"Sheets not found: {', '.join(missing)}")
+        return [name for name in sheets if name in sheetnames]
+
+    def read_frames(self, workbook: Workbook, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        シートの値を DataFrame としてまとめて読み込む
+
+        Args:
+            workbook: 処理中のWorkbook
+            sheet_names: 読み込むシート名
+
+        Returns:
+            シート名 -> DataFrame
+        """
+        # 解析を省略したシートは、入力ファイルのシート名で read_only モードから読み込む
+        passthrough = self.context.passthrough if self.context else None
+        source_names = {}
+        if passthrough is not None:
+            for sheet_name in sheet_names:
+                source_name = passthrough.source_sheet(workbook[sheet_name])
+                if source_name is not None:
+                    source_names[sheet_name] = source_name
+
+        frames = {}
+        if source_names:
+            source = openpyxl.load_workbook(self.context.input_file, read_only=True)
+            try:
+                for sheet_name, source_name in source_names.items():
+                    frames[sheet_name] = self.to_frame(source[source_name].iter_rows(values_only=True))
+            finally:
+                source.close()
+
+        for sheet_name in sheet_names:
+            if sheet_name not in frames:
+                frames[sheet_name] = self.to_frame(workbook[sheet_name].iter_rows(values_only=True))
+
+        return {sheet_name: frames[sheet_name] for sheet_name in sheet_names}
+
+    def to_frame(self, rows: Iterable[Tuple]) -> pd.DataFrame:
+        """行（セル値のタプル）を DataFrame に変換"""
+        rows = iter(rows)
+        columns = None
+        if self.config.get('header', True):
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            columns = list(header)
+        return pd.DataFrame.from_records(list(rows), columns=columns)
+
+    def write_frame(
+        self,
+        workbook: Workbook,
+        sheet_name: str,
+        frame: pd.DataFrame,
+        index: bool = False
+    ) -> Worksheet:
+        """
+        DataFrame をシートへ書き出す（既存のシートは同じ位置に作り直す）
+
+        Args:
+            workbook: 処理中のWorkbook
+            sheet_name: 書き出すシート名
+            frame: 書き出す DataFrame
+            index: インデックスを列として書き出すか
+
+        Returns:
+            書き出したWorksheetオブジェクト
+        """
+        if sheet_name in workbook.sheetnames:
+            position = workbook.sheetnames.index(sheet_name)
+            del workbook[sheet_name]
+            ws = self.create_sheet(workbook, sheet_name, position)
+        else:
+            ws = self.create_sheet(workbook, sheet_name)
+
+        if index:
+            frame = frame.reset_index()
+
+        if self.config.get('header', True):
+            ws.append([
+                column if isinstance(column, (str, int, float)) else str(column)
+                for column in frame.columns
+            ])
+
+        # 欠損値を None にし、numpy の型を Python の型に変換してから行ごとに追加する
+        for row in frame.astype(object).where(frame.notna(), None).to_numpy().tolist():
+            ws.append(row)
+
+        return ws
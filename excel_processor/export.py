@@ -0,0 +1,278 @@
+"""列指向形式での書き出し - 処理済みシートを CSV / Parquet / Arrow でも出力し、後続処理での .xlsx の再解析を不要にする"""
+
+import csv
+import datetime
+import importlib.util
+import numbers
+import pickle
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from .output import atomic_output
+
+# 出力形式 -> 拡張子（parquet / arrow は pyarrow が必要。ない場合は csv で出力）
+EXPORT_FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+    'csv': '.csv',
+}
+
+
+def arrow_available() -> bool:
+    """Parquet / Arrow の書き出しに使う pyarrow がインストールされているか"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class SheetExporter:
+    """
+    シートの行を列指向形式のファイルへ書き出すクラス
+
+    行は1行ずつ受け取り、ワークブックの保存とは別に ``<出力ディレクトリ>/<ファイル名>/<シート名>.<拡張子>`` へ書き出します。
+    保存したファイルを読み込み直さず、処理中のシート（ストリーミング処理では流れてくる行）から直接書き出します。
+
+    - csv: 行をそのまま書き出します（値のない列は空文字）
+    - parquet / arrow: 列ごとに値の型を集計し、型付きの列として書き出します。
+      行は一時ファイルに退避するため、メモリ使用量はシートの行数によらず ``chunk_rows`` 程度です。
+      数値と文字列が混在する列は文字列の列になります
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: export 設定（format, sheets, header, chunk_rows）
+        """
+        config = config or {}
+        requested = config.get('format', 'csv')
+        if requested not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format: {requested} (expected one of: {', '.join(EXPORT_FORMATS)})"
+            )
+        if requested != 'csv' and not arrow_available():
+            print(f"Warning: pyarrow is not installed; exporting sheets as CSV instead of {requested}.")
+            requested = 'csv'
+
+        self.format = requested
+        self.sheets: Optional[Set[str]] = set(config['sheets']) if config.get('sheets') else None
+        self.header = bool(config.get('header', True))
+        self.chunk_rows = int(config.get('chunk_rows', 65536))
+
+    @property
+    def suffix(self) -> str:
+        return EXPORT_FORMATS[self.format]
+
+    def wants(self, sheet_name: str) -> bool:
+        """書き出す対象のシートか"""
+        return self.sheets is None or sheet_name in self.sheets
+
+    def export_file(self, output_dir: Path, input_file: Path, sheet_name: str) -> Path:
+        """シートの書き出し先"""
+        safe_name = "".join("_" if ch in '\\/:*?"<>|' else ch for ch in sheet_name)
+        return Path(output_dir) / Path(input_file).stem / f"{safe_name}{self.suffix}"
+
+    def tee(self, rows: Iterable[tuple], export_file: Path) -> Iterator[tuple]:
+        """
+        行をそのまま返しながら書き出す（ストリーミング処理の行の流れに挟む）
+
+        最後まで読み進めた時点でファイルが完成します。途中で中断した場合は何も残しません。
+        """
+        export_file.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_output(export_file) as tmp_file, self._open_writer(tmp_file) as writer:
+            for row in rows:
+                writer.write(row)
+                yield row
+
+    def write(self, rows: Iterable[tuple], export_file: Path) -> Path:
+        """行をすべて書き出す"""
+        deque(self.tee(rows, export_file), maxlen=0)
+        return export_file
+
+    @contextmanager
+    def _open_writer(self, path: Path):
+        if self.format == 'csv':
+            writer = _CsvWriter(path)
+        else:
+            writer = _ArrowWriter(path, self.format, self.header, self.chunk_rows)
+        try:
+            yield writer
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+
+
+class _CsvWriter:
+    """行をそのまま CSV に書き出す"""
+
+    def __init__(self, path: Path):
+        # Excel で開いても文字化けしないよう BOM 付き UTF-8 で書き出す
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+
+    def write(self, row: tuple):
+        self._writer.writerow(["" if value is None else value for value in row])
+
+    def close(self):
+        self._file.close()
+
+    def abort(self):
+        self._file.close()
+
+
+class _ArrowWriter:
+    """
+    行を一時ファイルに退避しながら列ごとの型を集計し、最後に型付きの列として書き出す
+
+    最初の数行だけで型を決めると、後半に別の型の値が現れた時に書き出せなくなるため、
+    すべての行を見てから列の型を決めます。
+    """
+
+    def __init__(self, path: Path, file_format: str, header: bool, chunk_rows: int):
+        self.path = path
+        self.format = file_format
+        self.header = header
+        self.chunk_rows = chunk_rows
+        self.names: Optional[List[str]] = None
+        self.types: List[Set[type]] = []
+        self._chunk: List[tuple] = []
+        self._chunks = 0
+        self._spool = tempfile.TemporaryFile()
+
+    def write(self, row: tuple):
+        if self.header and self.names is None:
+            self.names = _column_names(row)
+            return
+
+        for index, value in enumerate(row):
+            if index >= len(self.types):
+                self.types.extend(set() for _ in range(index + 1 - len(self.types)))
+            if value is not None:
+                self.types[index].add(type(value))
+        self._chunk.append(row)
+        if len(self._chunk) >= self.chunk_rows:
+            self._flush()
+
+    def _flush(self):
+        if self._chunk:
+            pickle.dump(self._chunk, self._spool, protocol=pickle.HIGHEST_PROTOCOL)
+            self._chunks += 1
+            self._chunk = []
+
+    def close(self):
+        import pyarrow as pa
+
+        self._flush()
+        width = max(len(self.types), len(self.names or []))
+        names = _column_names(self.names or (), width)
+        self.types.extend(set() for _ in range(width - len(self.types)))
+        columns = [_arrow_column(types) for types in self.types]
+        schema = pa.schema([pa.field(name, arrow_type) for name, (arrow_type, _) in zip(names, columns)])
+
+        try:
+            with _open_arrow_writer(self.path, self.format, schema) as writer:
+                self._spool.seek(0)
+                for _ in range(self._chunks):
+                    chunk = pickle.load(self._spool)
+                    arrays = [
+                        pa.array(
+                            [convert(row[index]) if index < len(row) else None for row in chunk],
+                            type=arrow_type
+                        )
+                        for index, (arrow_type, convert) in enumerate(columns)
+                    ]
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        finally:
+            self._spool.close()
+
+    def abort(self):
+        self._spool.close()
+
+
+@contextmanager
+def _open_arrow_writer(path: Path, file_format: str, schema):
+    """Parquet / Arrow IPC ファイルの書き込み（write_table でチャンクを追記）"""
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(str(path), schema)
+    else:
+        import pyarrow as pa
+        writer = pa.ipc.new_file(str(path), schema)
+    try:
+        yield writer
+    finally:
+        writer.close()
+
+
+def _column_names(row, width: Optional[int] = None) -> List[str]:
+    """見出し行から列名を作る（空欄・重複は column_<列番号> や <名前>_<列番号> にする）"""
+    width = len(row) if width is None else width
+    names, seen = [], set()
+    for index in range(width):
+        value = row[index] if index < len(row) else None
+        name = str(value) if value not in (None, "") else f"column_{index + 1}"
+        if name in seen:
+            name = f"{name}_{index + 1}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _to_int(value):
+    return None if value is None else int(value)
+
+
+def _to_float(value):
+    return None if value is None else float(value)
+
+
+def _to_str(value):
+    return None if value is None else str(value)
+
+
+def _identity(value):
+    return value
+
+
+def _kind(value_type: type) -> str:
+    """値の型の分類（numpy の数値型も int / float として扱う）"""
+    if value_type is bool:
+        return 'bool'
+    if issubclass(value_type, numbers.Integral):
+        return 'int'
+    if issubclass(value_type, numbers.Real):
+        return 'float'
+    for kind, base in (
+        ('datetime', datetime.datetime),  # datetime は date のサブクラスなので先に判定
+        ('date', datetime.date),
+        ('time', datetime.time),
+        ('timedelta', datetime.timedelta),
+    ):
+        if issubclass(value_type, base):
+            return kind
+    return 'string'
+
+
+def _arrow_column(types: Set[type]):
+    """列に現れた値の型から、Arrow の型と値の変換を決める"""
+    import pyarrow as pa
+
+    kinds = {_kind(value_type) for value_type in types}
+    if kinds == {'bool'}:
+        return pa.bool_(), _identity
+    if kinds == {'int'}:
+        return pa.int64(), _to_int
+    if kinds and kinds <= {'int', 'float'}:
+        return pa.float64(), _to_float
+    if len(kinds) == 1:
+        temporal = {
+            'datetime': pa.timestamp("us"),
+            'date': pa.date32(),
+            'time': pa.time64("us"),
+            'timedelta': pa.duration("us"),
+        }.get(next(iter(kinds)))
+        if temporal is not None:
+            return temporal, _identity
+    # 文字列・値のない列・型が混在する列は文字列にする
+    return pa.string(), _to_str
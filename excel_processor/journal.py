@@ -0,0 +1,100 @@
+"""実行ジャーナル - 出力ディレクトリに各ファイルの処理状態を追記し、中断した実行を再開できるようにする"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+# 出力ディレクトリ内のジャーナルファイル
+JOURNAL_FILE = "_journal.jsonl"
+
+# ファイルの処理状態
+PENDING = "pending"        # 処理待ち
+PROCESSING = "processing"  # 処理中（中断した場合はこの状態のまま残る）
+SAVED = "saved"            # 出力ファイルと書き出しを保存済み（元ファイルは未削除）
+REMOVED = "removed"        # 元ファイルを削除済み（処理完了）
+FAILED = "failed"          # 処理に失敗
+
+
+class RunJournal:
+    """
+    1回の実行（出力ディレクトリ）ごとの処理状態を JSON Lines で追記するジャーナル
+
+    各行は O_APPEND で開いたファイルへの1回の write で書き込むため、
+    並列処理のワーカープロセスから同時に追記しても行が混ざりません。
+    ファイルごとの状態は、そのファイルの最後の行で決まります。
+    """
+
+    def __init__(self, run_dir: Path):
+        """
+        Args:
+            run_dir: 実行の出力ディレクトリ
+        """
+        self.path = Path(run_dir) / JOURNAL_FILE
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def record(self, file_name: str, state: str, **attrs: Any):
+        """
+        ファイルの状態を追記
+
+        Args:
+            file_name: 入力ファイル名
+            state: 処理状態（PENDING / PROCESSING / SAVED / REMOVED / FAILED）
+            **attrs: 追加で記録する値（エラー内容、出力サイズなど）
+        """
+        self._append([self._entry(file_name, state, attrs)])
+
+    def record_all(self, file_names: Iterable[str], state: str):
+        """複数のファイルの状態をまとめて追記"""
+        self._append([self._entry(file_name, state, {}) for file_name in file_names])
+
+    def repair(self):
+        """中断によって途中までしか書き込まれなかった最後の行を閉じる（再開時、追記する前に呼ぶ）"""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """
+        ファイル名 -> 最後に記録されたエントリー
+
+        中断によって途中までしか書き込まれなかった行は無視します。
+        """
+        states = {}
+        if not self.path.exists():
+            return states
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                states[entry['file']] = entry
+        return states
+
+    @staticmethod
+    def _entry(file_name: str, state: str, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'time': datetime.now().isoformat(timespec="milliseconds"),
+            'file': file_name,
+            'state': state,
+            'pid': os.getpid(),
+            **attrs,
+        }
+
+    def _append(self, entries):
+        if not entries:
+            return
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode('utf-8')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
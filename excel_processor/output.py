@@ -0,0 +1,160 @@
+"""出力ファイルの書き出し - ZIPの圧縮方式の選択と、書き込み途中のファイルを残さない出力"""
+
+import datetime
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing
+from openpyxl.workbook import Workbook
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from openpyxl.writer.excel import ExcelWriter
+
+# 圧縮方式 -> (ZIPの圧縮方式, 圧縮レベル)
+COMPRESSION_LEVELS: Dict[str, Tuple[int, Optional[int]]] = {
+    'store': (ZIP_STORED, None),    # 無圧縮（最速・最大サイズ）
+    'fast': (ZIP_DEFLATED, 1),      # 高速な deflate
+    'default': (ZIP_DEFLATED, None),  # openpyxl と同じ（zlib の既定レベル）
+    'max': (ZIP_DEFLATED, 9),       # 最大圧縮（最小サイズ）
+}
+
+# 書き込み中の一時ファイル（.<名前>.<pid>.tmp.xlsx）。中断すると残るため、再開時に削除する
+PARTIAL_OUTPUT_PATTERN = ".*.tmp.*"
+
+# ZIPのローカルファイルヘッダー（固定長部分）
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+# データディスクリプターの有無を示すフラグ（直接コピー時はヘッダーにサイズを書くため外す）
+_FLAG_DATA_DESCRIPTOR = 0x08
+
+
+class _ExcelWriter(ExcelWriter):
+    """通常のワークブックに追加された書き込み専用シート（StreamedWorksheet）も保存できる ExcelWriter"""
+
+    def write_worksheet(self, ws):
+        if self.workbook.write_only or not isinstance(ws, WriteOnlyWorksheet):
+            super().write_worksheet(ws)
+            return
+
+        # write_only のワークブックと同じく、書き出し済みの一時ファイルをそのままパートにする
+        ws._drawing = SpreadsheetDrawing()
+        ws._drawing.charts = ws._charts
+        ws._drawing.images = ws._images
+        if not ws.closed:
+            ws.close()
+        writer = ws._writer
+
+        ws._rels = writer._rels
+        self._archive.write(writer.out, ws.path[1:])
+        self.manifest.append(ws)
+        writer.cleanup()
+
+
+class OutputWriter:
+    """
+    ワークブックを指定した圧縮方式で保存するクラス
+
+    openpyxl の ExcelWriter が書き出すパートを、そのまま指定した圧縮方式の ZIP へ書き込みます。
+    """
+
+    def __init__(self, compression: str = 'default'):
+        """
+        Args:
+            compression: 圧縮方式（store / fast / default / max）
+        """
+        if compression not in COMPRESSION_LEVELS:
+            raise ValueError(
+                f"Unknown output compression: {compression} "
+                f"(expected one of: {', '.join(COMPRESSION_LEVELS)})"
+            )
+        self.compression = compression
+        self.compress_type, self.compress_level = COMPRESSION_LEVELS[compression]
+
+    def open_archive(self, output_file) -> ZipFile:
+        """設定した圧縮方式で書き込み用のZIPを開く"""
+        return ZipFile(
+            output_file, "w", self.compress_type, allowZip64=True, compresslevel=self.compress_level
+        )
+
+    def save(self, workbook: Workbook, output_file):
+        """
+        ワークブックを保存
+
+        Args:
+            workbook: 保存するWorkbook
+            output_file: 保存先（パスまたは書き込み可能なファイルオブジェクト）
+        """
+        # openpyxl の Workbook.save と同じく、更新日時を設定してから書き出す
+        workbook.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+        _ExcelWriter(workbook, self.open_archive(output_file)).save()
+
+
+@contextmanager
+def atomic_output(output_file: Path) -> Iterator[Path]:
+    """
+    出力ファイルを一時ファイルに書き込み、完了したら置き換える
+
+    書き込み中に中断しても、出力先には書きかけのファイルが残りません。
+    一時ファイルは出力先と同じディレクトリに、同じ拡張子で作成します。
+
+    Args:
+        output_file: 出力先
+
+    Yields:
+        書き込む一時ファイルのパス
+    """
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(f".{output_file.stem}.{os.getpid()}.tmp{output_file.suffix}")
+    try:
+        yield tmp_file
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+def write_raw(archive: ZipFile, info: ZipInfo, data: bytes):
+    """
+    圧縮済みのバイト列を、そのままZIPのエントリーとして書き込む
+
+    Args:
+        archive: 書き込み先のZIP（書き込みモード）
+        info: エントリーの情報（compress_type / CRC / file_size を設定済みであること）
+        data: 圧縮済みのバイト列
+    """
+    info.compress_size = len(data)
+    info.header_offset = archive.fp.tell()
+    archive.fp.write(info.FileHeader())
+    archive.fp.write(data)
+    archive.filelist.append(info)
+    archive.NameToInfo[info.filename] = info
+    archive.start_dir = archive.fp.tell()
+    archive._didModify = True
+
+
+def copy_raw(source: ZipFile, name: str, archive: ZipFile, arcname: str):
+    """
+    ZIPのエントリーを展開・再圧縮せずに、圧縮済みのバイト列のままコピー
+
+    Args:
+        source: コピー元のZIP（読み込みモード）
+        name: コピー元のエントリー名
+        archive: コピー先のZIP（書き込みモード）
+        arcname: コピー先のエントリー名
+    """
+    info = source.getinfo(name)
+    source.fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(source.fp.read(_LOCAL_HEADER.size))
+    name_length, extra_length = header[-2], header[-1]
+    source.fp.seek(name_length + extra_length, 1)
+    data = source.fp.read(info.compress_size)
+
+    copied = ZipInfo(arcname, date_time=info.date_time)
+    copied.compress_type = info.compress_type
+    copied.flag_bits = info.flag_bits & ~_FLAG_DATA_DESCRIPTOR
+    copied.external_attr = info.external_attr
+    copied.CRC = info.CRC
+    copied.file_size = info.file_size
+    write_raw(archive, copied, data)
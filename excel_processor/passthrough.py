@@ -0,0 +1,234 @@
+"""シート単位の読み込み省略 - プロセッサーが触れないシートを解析せず、元ファイルの内容をそのまま出力へコピー"""
+
+import re
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from zipfile import ZipFile
+
+from openpyxl.packaging.manifest import Manifest, Override
+from openpyxl.packaging.relationship import Relationship, RelationshipList, get_rels_path
+from openpyxl.reader.excel import ExcelReader
+from openpyxl.workbook import Workbook
+from openpyxl.xml.constants import (
+    ARC_CONTENT_TYPES,
+    ARC_SHARED_STRINGS,
+    ARC_WORKBOOK_RELS,
+    SHARED_STRINGS,
+)
+from openpyxl.xml.functions import fromstring, tostring
+
+from .output import OutputWriter, copy_raw
+
+# シートXMLの先頭から <dimension> を探す範囲（通常は先頭数百バイト以内にある）
+_DIMENSION_SEARCH_BYTES = 16 * 1024
+_DIMENSION_PATTERN = re.compile(rb"<(?:\w+:)?dimension\s+ref=\"([A-Z]*\d*:)?([A-Z]+\d+)\"")
+
+_STUB_SHEET = (
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>{}</sheetData></worksheet>'
+)
+
+
+def required_sheets(processors, sheetnames: List[str]) -> Optional[Set[str]]:
+    """
+    パイプライン全体で読み書きされる既存シートを集計
+
+    Args:
+        processors: 適用するプロセッサーのリスト
+        sheetnames: 入力ファイルのシート名
+
+    Returns:
+        解析が必要なシート名（None の場合は全シート）
+    """
+    required = set()
+    for processor in processors:
+        for declared in (processor.reads_sheets(sheetnames), processor.writes_sheets(sheetnames)):
+            if declared is None:
+                return None
+            required.update(declared)
+    return required & set(sheetnames)
+
+
+class _StubArchive:
+    """指定したパートだけ差し替えた内容を返す ZipFile のラッパー"""
+
+    def __init__(self, archive: ZipFile, stubs: Dict[str, bytes]):
+        self._archive = archive
+        self._stubs = stubs
+
+    def open(self, name, mode="r", *args, **kwargs):
+        if name in self._stubs:
+            return BytesIO(self._stubs[name])
+        return self._archive.open(name, mode, *args, **kwargs)
+
+    def read(self, name):
+        if name in self._stubs:
+            return self._stubs[name]
+        return self._archive.read(name)
+
+    def __getattr__(self, name):
+        return getattr(self._archive, name)
+
+
+class _SelectiveReader(ExcelReader):
+    """解析不要なシートを、使用範囲だけを持つ空のシートとして読み込む ExcelReader"""
+
+    def __init__(self, filename, select: Callable[[List[str]], Optional[Set[str]]]):
+        super().__init__(filename)
+        self._select = select
+        # シート名 -> (元ファイルのパート名, 読み込み時のセル数)
+        self.stubbed: Dict[str, Tuple[str, int]] = {}
+
+    def read_worksheets(self):
+        sheets = list(self.parser.find_sheets())
+        required = self._select([sheet.name for sheet, _ in sheets])
+
+        stubs = {}
+        if required is not None:
+            for sheet, rel in sheets:
+                if sheet.name in required or not self._can_stub(rel):
+                    continue
+                stub = self._make_stub(rel.target)
+                if stub is not None:
+                    stubs[rel.target] = stub
+                    self.stubbed[sheet.name] = (rel.target, 0)
+
+        if stubs:
+            self.archive = _StubArchive(self.archive, stubs)
+        super().read_worksheets()
+
+        for name, (target, _) in self.stubbed.items():
+            self.stubbed[name] = (target, len(self.wb[name]._cells))
+
+    def _can_stub(self, rel) -> bool:
+        """関連パート（図・コメント・テーブルなど）を持たないワークシートだけをコピー対象にする"""
+        if rel.target not in self.valid_files or "chartsheet" in rel.Type:
+            return False
+        return get_rels_path(rel.target) not in self.valid_files
+
+    def _make_stub(self, target: str) -> Optional[bytes]:
+        """
+        元のシートと同じ使用範囲（max_row / max_column）を持つ空のシートXMLを作る
+
+        <dimension> が見つからない場合は None（通常どおり解析する）
+        """
+        with self.archive.open(target) as src:
+            head = src.read(_DIMENSION_SEARCH_BYTES)
+        match = _DIMENSION_PATTERN.search(head)
+        if match is None:
+            return None
+
+        last_cell = match.group(2).decode("ascii")
+        row = re.sub(r"[A-Z]+", "", last_cell)
+        cells = "" if last_cell == "A1" else f'<row r="{row}"><c r="{last_cell}"/></row>'
+        return _STUB_SHEET.format(cells).encode("utf-8")
+
+
+class SheetPassthrough:
+    """
+    プロセッサーが読み書きしないシートを解析せずに処理するクラス
+
+    各プロセッサーの ``reads_sheets`` / ``writes_sheets`` の宣言から解析が必要なシートを決め、
+    それ以外のシートは使用範囲だけを持つ空のシートとして読み込みます。
+    保存時には、それらのシートのXMLを元ファイルから再圧縮せずにそのままコピーします。
+
+    図・コメント・テーブルなどの関連パートを持つシートは、宣言に関係なく通常どおり解析します。
+    """
+
+    def __init__(self, input_file: Path, processors):
+        """
+        Args:
+            input_file: 入力ファイル
+            processors: 適用するプロセッサーのリスト
+        """
+        self.input_file = Path(input_file)
+        self.processors = processors
+        self._stubbed: Dict[str, Tuple[str, int]] = {}
+        self._stub_sheets = {}
+        self._shared_strings_part: Optional[str] = None
+
+    @property
+    def sheets(self) -> List[str]:
+        """解析を省略したシート名"""
+        return list(self._stubbed)
+
+    def source_sheet(self, ws) -> Optional[str]:
+        """解析を省略したシートであれば入力ファイルでのシート名を、そうでなければ None を返す"""
+        for name, stub in self._stub_sheets.items():
+            if stub is ws:
+                return name
+        return None
+
+    def load(self) -> Workbook:
+        """必要なシートだけを解析してワークブックを読み込む"""
+        reader = _SelectiveReader(self.input_file, lambda names: required_sheets(self.processors, names))
+        reader.read()
+
+        workbook = reader.wb
+        self._stubbed = reader.stubbed
+        self._stub_sheets = {name: workbook[name] for name in self._stubbed}
+        shared_strings = reader.package.find(SHARED_STRINGS)
+        self._shared_strings_part = shared_strings.PartName[1:] if shared_strings is not None else None
+        return workbook
+
+    def save(self, workbook: Workbook, output_file: Path, writer: Optional[OutputWriter] = None):
+        """
+        ワークブックを保存し、解析を省略したシートの内容を元ファイルからコピー
+
+        Args:
+            workbook: 保存するWorkbook
+            output_file: 保存先
+            writer: 圧縮方式（None の場合は openpyxl と同じ設定）。コピーしたシートは元ファイルの圧縮のまま
+        """
+        writer = writer or OutputWriter()
+        remaining = [
+            (ws, self._stubbed[name]) for name, ws in self._stub_sheets.items()
+            if ws in workbook.worksheets
+        ]
+        if not remaining:
+            writer.save(workbook, output_file)
+            return
+
+        for ws, (_, cell_count) in remaining:
+            if len(ws._cells) != cell_count:
+                raise RuntimeError(
+                    f"Cells of sheet '{ws.title}' were accessed, "
+                    "but no processor declared it in reads_sheets() / writes_sheets()"
+                )
+
+        buffer = BytesIO()
+        writer.save(workbook, buffer)
+
+        # openpyxl が保存したパート名 -> 元ファイルのパート名
+        parts = {ws.path[1:]: target for ws, (target, _) in remaining}
+
+        with ZipFile(self.input_file) as source, ZipFile(buffer) as saved, \
+                writer.open_archive(output_file) as archive:
+            for info in saved.infolist():
+                name = info.filename
+                if name in parts:
+                    copy_raw(source, parts[name], archive, name)
+                elif name == ARC_CONTENT_TYPES and self._shared_strings_part:
+                    archive.writestr(name, self._add_shared_strings_type(saved.read(name)))
+                elif name == ARC_WORKBOOK_RELS and self._shared_strings_part:
+                    archive.writestr(name, self._add_shared_strings_rel(saved.read(name)))
+                else:
+                    copy_raw(saved, name, archive, name)
+
+            # openpyxl は文字列をインラインで書き出すため、コピーしたシートが参照する共有文字列表を追加する
+            if self._shared_strings_part:
+                copy_raw(source, self._shared_strings_part, archive, ARC_SHARED_STRINGS)
+
+    @staticmethod
+    def _add_shared_strings_type(xml: bytes) -> bytes:
+        manifest = Manifest.from_tree(fromstring(xml))
+        manifest.Override.append(Override(PartName="/" + ARC_SHARED_STRINGS, ContentType=SHARED_STRINGS))
+        return tostring(manifest.to_tree())
+
+    @staticmethod
+    def _add_shared_strings_rel(xml: bytes) -> bytes:
+        rels = RelationshipList.from_tree(fromstring(xml))
+        rels.append(Relationship(Id="rIdSharedStrings", type="sharedStrings", Target="sharedStrings.xml"))
+        return tostring(rels.to_tree())
+
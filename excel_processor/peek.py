@@ -0,0 +1,237 @@
+"""ワークブックの簡易確認 - ワークブック全体を読み込まずに、シート一覧・サイズ・先頭の行だけを読む"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from zipfile import ZipFile
+
+from openpyxl.cell.text import Text
+from openpyxl.packaging.manifest import Manifest
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
+from openpyxl.packaging.workbook import WorkbookPackage
+from openpyxl.reader.excel import _find_workbook_part
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH
+from openpyxl.worksheet._read_only import read_dimension
+from openpyxl.worksheet._reader import WorkSheetParser
+from openpyxl.xml.constants import ARC_CONTENT_TYPES, ARC_STYLE, SHARED_STRINGS, SHEET_MAIN_NS
+from openpyxl.xml.functions import fromstring, iterparse
+
+_STRING_TAG = '{%s}si' % SHEET_MAIN_NS
+
+
+class _LazySharedStrings:
+    """
+    共有文字列テーブルを、参照された番号まで少しずつ読み進めるリスト
+
+    先頭の行で使われる文字列だけを読めばよいため、共有文字列が巨大なファイルでも待ち時間が増えません。
+    """
+
+    def __init__(self, archive: ZipFile, part: Optional[str]):
+        self._archive = archive
+        self._part = part
+        self._strings: List[str] = []
+        self._source = None
+        self._nodes = None
+
+    def __getitem__(self, index: int) -> str:
+        while index >= len(self._strings):
+            if not self._read_next():
+                raise IndexError(f"Shared string {index} not found")
+        return self._strings[index]
+
+    def _read_next(self) -> bool:
+        if self._part is None:
+            return False
+        if self._nodes is None:
+            self._source = self._archive.open(self._part)
+            self._nodes = iterparse(self._source)
+        for _, node in self._nodes:
+            if node.tag == _STRING_TAG:
+                # openpyxl の read_string_table と同じ変換
+                self._strings.append(Text.from_tree(node).content.replace('x005F_', ''))
+                node.clear()
+                return True
+        self.close()
+        self._part = None
+        return False
+
+    def close(self):
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+
+@dataclass
+class SheetPeek:
+    """シートの情報（<dimension> タグから読んだ使用範囲）"""
+
+    title: str
+    part: str
+    state: str = "visible"
+    max_row: Optional[int] = None  # <dimension> がない場合・グラフシートは None
+    max_column: Optional[int] = None
+    is_chartsheet: bool = False
+    workbook: Optional["WorkbookPeek"] = field(default=None, repr=False)
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None, values_only: bool = True) -> Iterator[tuple]:
+        """Worksheet.iter_rows と同じ形式で行の値を返す（values_only のみ対応）"""
+        if not values_only:
+            raise ValueError("SheetPeek only supports values_only=True")
+        return self.workbook.iter_rows(self.title, min_row=min_row, max_row=max_row)
+
+
+class WorkbookPeek:
+    """
+    ワークブックの中身を簡易確認するクラス
+
+    ``openpyxl.load_workbook`` と違い、シートのオブジェクトモデルを作りません。
+    シート一覧はワークブックのマニフェスト、各シートのサイズは <dimension> タグだけから読み、
+    行の値は指定したシートの先頭から必要な行数だけを読みます。ファイルサイズに関係なく短時間で終わります。
+
+    ``sheetnames`` / ``active`` / ``workbook[シート名]`` は Workbook と同じように使えるため、
+    ``print_sheet_info`` / ``print_sheet_preview`` にそのまま渡せます。
+
+    Example:
+        with WorkbookPeek("input/large.xlsx") as peek:
+            print(peek.sheetnames)
+            for row in peek.iter_rows("Sheet1", max_row=5):
+                print(row)
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Excelファイル（.xlsx）のパス
+        """
+        self.path = Path(path)
+        self._archive = ZipFile(self.path)
+        try:
+            self._read_manifest()
+        except Exception:
+            self._archive.close()
+            raise
+
+    def _read_manifest(self):
+        archive = self._archive
+        manifest = Manifest.from_tree(fromstring(archive.read(ARC_CONTENT_TYPES)))
+        workbook_part = _find_workbook_part(manifest).PartName[1:]
+        shared_strings = manifest.find(SHARED_STRINGS)
+        self._shared_strings_part = shared_strings.PartName[1:] if shared_strings is not None else None
+
+        package = WorkbookPackage.from_tree(fromstring(archive.read(workbook_part)))
+        self.epoch = CALENDAR_MAC_1904 if package.properties and package.properties.date1904 else WINDOWS_EPOCH
+        rels = get_dependents(archive, get_rels_path(workbook_part)).to_dict()
+        valid_files = set(archive.namelist())
+
+        self.sheets: List[SheetPeek] = []
+        for sheet in package.sheets:
+            if not sheet.id or sheet.id not in rels:
+                continue
+            rel = rels[sheet.id]
+            peek = SheetPeek(
+                title=sheet.name,
+                part=rel.target,
+                state=sheet.state or "visible",
+                is_chartsheet="chartsheet" in rel.Type,
+                workbook=self,
+            )
+            if not peek.is_chartsheet and rel.target in valid_files:
+                with archive.open(rel.target) as src:
+                    boundaries = read_dimension(src)
+                if boundaries is not None:
+                    _, _, peek.max_column, peek.max_row = boundaries
+            self.sheets.append(peek)
+
+        active = package.active or 0
+        self._active = self.sheets[active] if 0 <= active < len(self.sheets) else None
+        self._date_formats: Optional[Tuple[set, set]] = None
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return [sheet.title for sheet in self.sheets]
+
+    @property
+    def active(self) -> Optional[SheetPeek]:
+        return self._active
+
+    def __getitem__(self, name: str) -> SheetPeek:
+        for sheet in self.sheets:
+            if sheet.title == name:
+                return sheet
+        raise KeyError(f"Worksheet {name} does not exist.")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sheetnames
+
+    def iter_rows(self, sheet_name: Optional[str] = None, min_row: int = 1, max_row: Optional[int] = 10) -> Iterator[tuple]:
+        """
+        シートの先頭から行の値を読む
+
+        読み込み専用モードと同じく、値のない行は None で埋め、列数は使用範囲の列数に揃えます。
+
+        Args:
+            sheet_name: シート名（Noneの場合はアクティブシート）
+            min_row: 最初の行番号
+            max_row: 最後の行番号（Noneの場合は最終行まで）
+
+        Yields:
+            行の値のタプル
+        """
+        sheet = self[sheet_name] if sheet_name else self.active
+        if sheet is None or sheet.is_chartsheet:
+            return
+
+        date_formats, timedelta_formats = self._read_date_formats()
+        shared_strings = _LazySharedStrings(self._archive, self._shared_strings_part)
+        width = sheet.max_column
+        expected = min_row
+        try:
+            with self._archive.open(sheet.part) as src:
+                parser = WorkSheetParser(
+                    src, shared_strings, epoch=self.epoch,
+                    date_formats=date_formats, timedelta_formats=timedelta_formats
+                )
+                for row_idx, cells in parser.parse():
+                    if max_row is not None and row_idx > max_row:
+                        break
+                    if row_idx < min_row:
+                        continue
+                    if width is None:
+                        width = max((cell['column'] for cell in cells), default=0)
+                    for _ in range(expected, row_idx):
+                        yield (None,) * width
+                    values = [None] * width
+                    for cell in cells:
+                        if cell['column'] > len(values):
+                            values.extend([None] * (cell['column'] - len(values)))
+                        values[cell['column'] - 1] = cell['value']
+                    yield tuple(values)
+                    expected = row_idx + 1
+        finally:
+            shared_strings.close()
+
+        # 使用範囲内の末尾の空行
+        if sheet.max_row is not None and width is not None:
+            last_row = sheet.max_row if max_row is None else min(max_row, sheet.max_row)
+            for _ in range(expected, last_row + 1):
+                yield (None,) * width
+
+    def _read_date_formats(self) -> Tuple[set, set]:
+        """日付・時間として表示するセルのスタイル番号（スタイルシートだけを読む）"""
+        if self._date_formats is None:
+            try:
+                stylesheet = Stylesheet.from_tree(fromstring(self._archive.read(ARC_STYLE)))
+                self._date_formats = (stylesheet.date_formats, stylesheet.timedelta_formats)
+            except KeyError:
+                self._date_formats = (set(), set())
+        return self._date_formats
+
+    def close(self):
+        self._archive.close()
+
+    def __enter__(self) -> "WorkbookPeek":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
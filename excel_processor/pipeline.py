@@ -0,0 +1,212 @@
+"""ステージパイプライン - 読み込み・処理・保存を別プロセスで重ねて実行"""
+
+import multiprocessing
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional
+
+
+def pipeline_supported() -> bool:
+    """ステージパイプラインが使えるか（ワークブックを fork で子プロセスへ引き継ぐため、fork が必要）"""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+class _WorkerTraceback(Exception):
+    """子プロセスで発生した例外のトラックバック（親プロセスでは例外の __cause__ として表示される）"""
+
+    def __init__(self, tb: str):
+        super().__init__(tb)
+        self.tb = tb
+
+    def __str__(self):
+        return f"\n\"\"\"\n{self.tb}\"\"\""
+
+
+class _Worker:
+    """1ファイル分の処理・保存を行う子プロセス"""
+
+    def __init__(self, job: Any, connection, process):
+        self.job = job
+        self.connection = connection
+        self.process = process
+        self.processed = False
+        self.process_sec = 0.0
+
+    def wait_processed(self):
+        """処理ステージの完了（保存ステージの開始）を待つ"""
+        if not self.processed:
+            message = self._receive()
+            if message is not None:
+                self.process_sec = message[1]
+            self.processed = True
+
+    def wait_done(self):
+        """保存ステージの完了を待ち、(保存時間, 例外, 子プロセスからの報告) を返す"""
+        self.wait_processed()
+        message = self._receive()
+        self.connection.close()
+        self.process.join()
+        if message is None:
+            error = RuntimeError(f"Pipeline worker exited unexpectedly (exit code: {self.process.exitcode})")
+            return 0.0, error, None
+        _, save_sec, error, tb, report = message
+        if error is not None and tb is not None:
+            # 例外は pickle で送ると元のトレースバックを失うため、子プロセスで整形したものを付ける
+            error.__cause__ = _WorkerTraceback(tb)
+        return save_sec, error, report
+
+    def _receive(self):
+        try:
+            return self.connection.recv()
+        except EOFError:
+            return None
+
+
+class StagedPipeline:
+    """
+    読み込み・処理・保存の3ステージを、ファイルごとに重ねて実行するクラス
+
+    親プロセスがファイルN+1 を読み込んでいる間に、子プロセスがファイルN を処理し、
+    別の子プロセスがファイルN-1 を保存します。読み込んだワークブックは fork によって
+    子プロセスへ引き継ぐため、ステージ間でのデータの受け渡し（シリアライズ）は発生しません。
+
+    - 処理ステージは常に1ファイルずつ順番に実行されます（前のファイルの処理が終わるまで次を開始しない）
+    - 保存待ち・保存中のファイル数は ``queue_size`` 以下に抑えられ、メモリ使用量の上限になります
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Any], Any],
+        process: Callable[[Any], None],
+        save: Callable[[Any], None],
+        complete: Callable[[Any, Optional[BaseException], Any], None],
+        skip: Callable[[Any], bool] = lambda job: False,
+        report: Callable[[Any], Any] = lambda job: None,
+        release: Callable[[Any], None] = lambda job: None,
+        queue_size: int = 2
+    ):
+        """
+        Args:
+            load: 読み込みステージ（親プロセス、アイテムを受け取りジョブを返す）
+            process: 処理ステージ（子プロセス）
+            save: 保存ステージ（子プロセス）
+            complete: 完了処理（親プロセス、ジョブ・例外・子プロセスからの報告を受け取る）
+            skip: 読み込み後に処理・保存が不要なジョブかどうか（読み込みエラー・キャッシュヒットなど）
+            report: 子プロセスの終了時に親プロセスへ送る値を作る関数（pickle 可能な値を返す）
+            release: 子プロセスの開始直後に親プロセスで呼ぶ関数（子プロセスへ引き継いだデータへの参照を解放する）
+            queue_size: 保存待ち・保存中のファイル数の上限
+        """
+        self.load = load
+        self.process = process
+        self.save = save
+        self.complete = complete
+        self.skip = skip
+        self.report = report
+        self.release = release
+        self.queue_size = max(1, queue_size)
+
+        self.busy_sec = {'load': 0.0, 'process': 0.0, 'save': 0.0}
+        self.items = 0
+        self.wall_sec = 0.0
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """アイテムをパイプラインに流し、完了したジョブを完了順に返す"""
+        context = multiprocessing.get_context("fork")
+        workers: Deque[_Worker] = deque()
+        start = time.perf_counter()
+
+        for item in items:
+            load_start = time.perf_counter()
+            job = self.load(item)
+            self.busy_sec['load'] += time.perf_counter() - load_start
+
+            if self.skip(job):
+                self.complete(job, None, None)
+                yield self._finish(job)
+                continue
+
+            # 処理ステージは1ファイルずつ（直前のファイルの処理が終わってから次を開始する）
+            if workers:
+                workers[-1].wait_processed()
+            # 保存待ちのファイル数を上限以下にする
+            while len(workers) >= self.queue_size:
+                yield self._reap(workers.popleft())
+
+            receiver, sender = context.Pipe(duplex=False)
+            # プロセッサーがさらにプロセスプールを使えるよう、デーモンプロセスにはしない（完了は必ず待つ）
+            process = context.Process(target=self._run_worker, args=(job, sender))
+            process.start()
+            sender.close()
+            # ワークブックは子プロセスが持っているため、保存待ちの間も親プロセスのメモリを占有しないようにする
+            self.release(job)
+            workers.append(_Worker(job, receiver, process))
+
+            # 完了済みの子プロセスは先に回収する
+            while workers and workers[0].processed and workers[0].connection.poll():
+                yield self._reap(workers.popleft())
+
+        while workers:
+            yield self._reap(workers.popleft())
+
+        self.wall_sec = time.perf_counter() - start
+
+    def _run_worker(self, job: Any, sender):
+        """子プロセス: 処理・保存を行い、各ステージの時間と結果を親プロセスへ送る"""
+        error = None
+        tb = None
+        start = time.perf_counter()
+        try:
+            self.process(job)
+        except Exception as e:
+            error = e
+            tb = traceback.format_exc()
+        sender.send(('processed', time.perf_counter() - start))
+
+        save_sec = 0.0
+        if error is None:
+            start = time.perf_counter()
+            try:
+                self.save(job)
+            except Exception as e:
+                error = e
+                tb = traceback.format_exc()
+            save_sec = time.perf_counter() - start
+
+        report = self.report(job)
+        try:
+            sender.send(('done', save_sec, error, tb, report))
+        except Exception:
+            # 例外オブジェクトを送れない場合は文字列にする
+            sender.send(('done', save_sec, RuntimeError(repr(error)), tb, report))
+        finally:
+            sender.close()
+
+    def _reap(self, worker: _Worker) -> Any:
+        save_sec, error, report = worker.wait_done()
+        self.busy_sec['process'] += worker.process_sec
+        self.busy_sec['save'] += save_sec
+        self.complete(worker.job, error, report)
+        return self._finish(worker.job)
+
+    def _finish(self, job: Any) -> Any:
+        self.items += 1
+        return job
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """ステージごとの稼働時間と稼働率（稼働時間 / 全体の経過時間）"""
+        return {
+            stage: {
+                'busy_sec': round(busy_sec, 3),
+                'utilisation': round(busy_sec / self.wall_sec, 3) if self.wall_sec > 0 else 0.0,
+            }
+            for stage, busy_sec in self.busy_sec.items()
+        }
+
+    def format_stats(self) -> str:
+        """稼働率の1行表示"""
+        stages = " | ".join(
+            f"{stage} {stats['utilisation']:.0%} ({stats['busy_sec']:.2f}s)"
+            for stage, stats in self.stats().items()
+        )
+        return f"Pipeline utilisation ({self.items} files in {self.wall_sec:.2f}s): {stages}"
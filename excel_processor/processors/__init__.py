@@ -3,39 +3,91 @@
 import importlib
 import inspect
 import pkgutil
+import re
 from pathlib import Path
+from typing import Dict
 
 from ..base_processor import BaseSheetProcessor
 
-__all__ = []
+# クラス定義の検出用（基底クラスの記述が複数行にわたる場合にも対応）
+_CLASS_PATTERN = re.compile(r"^class\s+(\w+)\s*\(([^)]*)\)\s*:", re.MULTILINE)
 
 
-def _load_processors_in_directory():
+def _scan_processors_in_directory() -> Dict[str, str]:
     """
-    processors ディレクトリ直下のモジュールから BaseSheetProcessor を継承した
-    クラスを動的に読み込み、モジュールレベルに公開する。
+    processors ディレクトリ直下のソースを走査し、プロセッサー名からモジュール名への対応表を作る。
+
+    モジュールは import せず、基底クラスに "Processor" を含むクラス定義だけを候補にする。
+    実際に BaseSheetProcessor のサブクラスかどうかは、初めて使われた時に確認する。
+    対応表にないクラスは、参照された時に _load_unindexed_processors で探す。
     """
+    registry = {}
     base_dir = Path(__file__).parent
-    if not base_dir.exists():
+
+    for path in sorted(base_dir.glob("*.py")):
+        if path.stem == "__init__":
+            continue
+
+        source = path.read_text(encoding="utf-8")
+        for name, bases in _CLASS_PATTERN.findall(source):
+            if "Processor" in bases:
+                registry.setdefault(name, f"{__name__}.{path.stem}")
+
+    return registry
+
+
+_REGISTRY = _scan_processors_in_directory()
+
+__all__ = sorted(_REGISTRY)
+
+# 対応表にないプロセッサーを探すために、全モジュールを import 済みかどうか
+_unindexed_loaded = False
+
+
+def _load_unindexed_processors():
+    """
+    processors ディレクトリ直下の全モジュールを import し、BaseSheetProcessor を継承した
+    クラスをモジュールレベルに公開する（1回だけ実行）。
+
+    基底クラス名に "Processor" を含まないクラス（例: class Foo(MyBase):）は対応表に載らないため、
+    対応表にない名前が参照された時にだけ、この方法で探す。
+    """
+    global _unindexed_loaded
+    if _unindexed_loaded:
         return
+    _unindexed_loaded = True
 
-    for module_info in pkgutil.iter_modules([str(base_dir)]):
-        # __init__ やパッケージはスキップ
-        if module_info.name == "__init__" or module_info.ispkg:
+    for module_info in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if module_info.ispkg:
             continue
 
         module_name = f"{__name__}.{module_info.name}"
         module = importlib.import_module(module_name)
-
         for name, obj in inspect.getmembers(module, inspect.isclass):
-            if obj.__module__ != module_name:
-                continue
-            if not issubclass(obj, BaseSheetProcessor):
-                continue
+            if obj.__module__ == module_name and issubclass(obj, BaseSheetProcessor):
+                globals().setdefault(name, obj)
+                if name not in __all__:
+                    __all__.append(name)
+
+
+def __getattr__(name: str):
+    """プロセッサーが初めて参照された時に、そのモジュールだけを import する"""
+    module_name = _REGISTRY.get(name)
+    if module_name is None:
+        if not name.startswith("__"):
+            _load_unindexed_processors()
+            if name in globals():
+                return globals()[name]
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(module_name)
+    obj = getattr(module, name, None)
+    if not (isinstance(obj, type) and issubclass(obj, BaseSheetProcessor)):
+        raise AttributeError(f"{module_name}.{name} is not a BaseSheetProcessor subclass")
 
-            globals()[name] = obj
-            if name not in __all__:
-                __all__.append(name)
+    globals()[name] = obj
+    return obj
 
 
-_load_processors_in_directory()
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
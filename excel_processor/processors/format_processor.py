@@ -1,15 +1,21 @@
 """書式を適用するプロセッサー"""
 
+import time
+from copy import copy
+
 from openpyxl.workbook import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
-from excel_processor.base_processor import BaseSheetProcessor
+from excel_processor.base_processor import CellVisitorProcessor
 
 
-class FormatProcessor(BaseSheetProcessor):
+class FormatProcessor(CellVisitorProcessor):
     """
     全シートにフォーマットを適用するプロセッサー
 
+    ヘッダー・データ行・罫線・列幅を1回のセル走査でまとめて処理します。
+    前後に他の CellVisitorProcessor がある場合は、同じ走査にまとめて実行されます。
+
     設定例:
         header_color: "4472C4"  # ヘッダー背景色（16進数）
         font_name: "Arial"  # フォント名
@@ -20,62 +26,94 @@ class FormatProcessor(BaseSheetProcessor):
         exclude_sheets: ["Summary"]  # 除外するシート名
     """
 
-    def process(self, workbook: Workbook, file_path: str) -> Workbook:
+    def reads_sheets(self, sheetnames):
+        exclude_sheets = self.config.get('exclude_sheets', [])
+        return [name for name in sheetnames if name not in exclude_sheets]
+
+    def writes_sheets(self, sheetnames):
+        return self.reads_sheets(sheetnames)
+
+    def begin_workbook(self, workbook: Workbook, file_path: str):
         header_color = self.config.get('header_color', '4472C4')
         font_name = self.config.get('font_name', 'Arial')
         font_size = self.config.get('font_size', 11)
         font_color = self.config.get('font_color', "FFFFFF")
         apply_borders = self.config.get('apply_borders', True)
-        auto_width = self.config.get('auto_width', True)
-        exclude_sheets = self.config.get('exclude_sheets', [])
+        self._auto_width = self.config.get('auto_width', True)
+        self._exclude_sheets = self.config.get('exclude_sheets', [])
 
         self.log("Applying formatting to all sheets")
 
-        for sheet_name in workbook.sheetnames:
-            if sheet_name in exclude_sheets:
-                self.log(f"Skipping sheet: {sheet_name}")
-                continue
-
-            ws = workbook[sheet_name]
-            self.log(f"Formatting sheet: {sheet_name}")
-
-            # ヘッダー行（1行目）のフォーマット
-            if ws.max_row > 0:
-                for cell in ws[1]:
-                    cell.font = Font(name=font_name, size=font_size, bold=True, color=font_color)
-                    cell.fill = PatternFill(start_color=header_color, end_color=header_color, fill_type='solid')
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-
-            # データ行のフォント設定
-            for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-                for cell in row:
-                    if cell.font.size is None or cell.font.name is None:
-                        cell.font = Font(name=font_name, size=font_size)
-
-            # 罫線を適用
-            if apply_borders:
-                thin_border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-                for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-                    for cell in row:
-                        cell.border = thin_border
-
-            # 列幅の自動調整
-            if auto_width:
-                for column in ws.columns:
-                    max_length = 0
-                    column_letter = get_column_letter(column[0].column)
-
-                    for cell in column:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-
-                    adjusted_width = min(max_length * 2 + 4, 50)
-                    ws.column_dimensions[column_letter].width = adjusted_width
-
-        self.log("Formatting completed")
-        return workbook
+        # 書式オブジェクトは不変なので一度だけ作成して全セルで共有する
+        self._header_font = Font(name=font_name, size=font_size, bold=True, color=font_color)
+        self._header_fill = PatternFill(start_color=header_color, end_color=header_color, fill_type='solid')
+        self._header_alignment = Alignment(horizontal='center', vertical='center')
+        self._data_font = Font(name=font_name, size=font_size)
+        self._thin_border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        ) if apply_borders else None
+
+        self._style_cache = {}
+        self._total_cells = 0
+        self._start_time = time.perf_counter()
+
+    def accepts_sheet(self, ws) -> bool:
+        if ws.title in self._exclude_sheets:
+            self.log(f"Skipping sheet: {ws.title}")
+            return False
+        return True
+
+    def begin_sheet(self, ws):
+        self.log(f"Formatting sheet: {ws.title}")
+        self._max_lengths = [0] * ws.max_column
+
+    def visit_row(self, row):
+        is_header = row[0].row == 1
+        style_cache = self._style_cache
+        max_lengths = self._max_lengths
+
+        for cell in row:
+            # 書式の適用結果は「元の書式 + ヘッダーかどうか」だけで決まるため、
+            # 一度計算した結果を同じ書式のセルに使い回す
+            current = cell._style
+            key = (is_header, None if current is None else tuple(current))
+            style = style_cache.get(key)
+            if style is None:
+                if is_header:
+                    # ヘッダー行（1行目）のフォーマット
+                    cell.font = self._header_font
+                    cell.fill = self._header_fill
+                    cell.alignment = self._header_alignment
+                elif cell.font.size is None or cell.font.name is None:
+                    # データ行のフォント設定
+                    cell.font = self._data_font
+                if self._thin_border is not None:
+                    cell.border = self._thin_border
+                style_cache[key] = copy(cell._style)
+            else:
+                cell._style = copy(style)
+
+            if self._auto_width:
+                value = cell.value
+                if value:
+                    length = len(str(value))
+                    if length > max_lengths[cell.column - 1]:
+                        max_lengths[cell.column - 1] = length
+
+        self._total_cells += len(row)
+
+    def end_sheet(self, ws):
+        # 列幅の自動調整
+        if self._auto_width:
+            for column_index, max_length in enumerate(self._max_lengths, 1):
+                adjusted_width = min(max_length * 2 + 4, 50)
+                ws.column_dimensions[get_column_letter(column_index)].width = adjusted_width
+
+    def end_workbook(self, workbook: Workbook):
+        self.add_cells(self._total_cells)
+        elapsed = time.perf_counter() - self._start_time
+        rate = self._total_cells / elapsed if elapsed > 0 else 0
+        self.log(f"Formatting completed: {self._total_cells} cells in {elapsed:.3f}s ({rate:,.0f} cells/s)")
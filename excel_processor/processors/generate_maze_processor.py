@@ -1,15 +1,27 @@
 """サマリーシートを追加するプロセッサー"""
 
-import random
-import sys
+import itertools
+import mmap
+import os
+import tempfile
+from array import array
 from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from copy import copy
 from datetime import datetime
+from pathlib import Path
 
+import numpy as np
 from openpyxl import Workbook
+from openpyxl.cell.cell import Cell
+from openpyxl.formatting.rule import ColorScaleRule, FormulaRule
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 
 from excel_processor.base_processor import BaseSheetProcessor
+from excel_processor.output import OutputWriter, atomic_output
+from excel_processor.streamed_sheet import create_streamed_sheet, is_streamed
 
 
 class GenerateMazeProcessor(BaseSheetProcessor):
@@ -19,20 +31,69 @@ class GenerateMazeProcessor(BaseSheetProcessor):
     - Distance : Start（S）からの距離
     - Path : Start（S）からGoal（G)までの最短距離
 
+    ``count`` が2以上の場合は、迷路ごとに ``Maze_001`` / ``Distance_001`` / ``Path_001`` のように
+    番号付きのシートを生成します。迷路の生成・探索はワーカープロセスで並列に行い、
+    ``mazes_per_workbook`` を超える分は別のワークブックとして、出力ディレクトリの
+    ``<ファイル名>/maze_02.xlsx`` などへ保存します（番号はワークブックの数の桁数でゼロ埋めします。
+    別のワークブックは描画・保存までワーカープロセスで行います）。
+    ExcelProcessor から実行されていない場合（ノートブックなど）の出力ディレクトリは ``output/`` です。
+
     設定例:
         height: 10
         width: 10
+        seed: 42  # 乱数シード（省略時は毎回異なる迷路）
+        render_mode: "styled"  # "styled"=セルごとに書式設定, "conditional"=条件付き書式で色付け（Maze / Path の壁は "#"）
+        algorithm: "backtracker"  # "eller"=1行ずつ生成して書き込み専用シートへ出力（数十万行の迷路向け）
+        buffer_dir: null  # algorithm: eller で探索用のバッファを置くディレクトリ（省略時は一時ディレクトリ）
+        count: 1  # 生成する迷路の数
+        sheet_prefix: ""  # シート名の接頭辞（例: "train_" -> "train_Maze_001"）
+        mazes_per_workbook: null  # 1ワークブックあたりの迷路の数（超えた分は <ファイル名>/maze_02.xlsx などに保存）
+        workers: 0  # 迷路を生成するプロセス数（1=逐次処理、0=CPUコア数）
     """
 
-    def process(self, workbook: Workbook, _file_path: str) -> Workbook:
+    @property
+    def cacheable(self):
+        # seed 未指定の場合は毎回異なる迷路になるため、結果をキャッシュしない
+        # 別のワークブックに分割する場合も、キャッシュは処理中のファイルしか保存できないため対象外
+        return self.config.get("seed") is not None and not self._splits_workbook()
+
+    def reads_sheets(self, sheetnames):
+        return []
+
+    def writes_sheets(self, sheetnames):
+        names = []
+        for index in range(1, self._mazes_in_workbook() + 1):
+            names.extend(self._sheet_names(index))
+        return names
+
+    def process(self, workbook: Workbook, file_path: str) -> Workbook:
         height = self.config.get("height", 10)
         width = self.config.get("width", 10)
+        render_mode = self.config.get("render_mode", "styled")
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render_mode: {render_mode} (expected one of {RENDER_MODES})")
+        algorithm = self.config.get("algorithm", "backtracker")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm} (expected one of {ALGORITHMS})")
+        _validate_maze_size(width, height)
+
+        if algorithm == "eller":
+            self._process_streaming(workbook, width, height, render_mode)
+        elif self._count() == 1:
+            self._process_single(workbook, width, height, render_mode)
+        else:
+            self._process_batch(workbook, file_path, width, height, render_mode)
 
+        return workbook
+
+    def _process_single(self, workbook, width, height, render_mode):
+        """迷路を1つ生成し、処理中のワークブックへ出力"""
         maze, start, goal = self._run_with_timer(
             "generate_maze",
             generate_maze,
             width=width,
             height=height,
+            seed=self.config.get("seed"),
         )
 
         visit = self._run_with_timer(
@@ -43,86 +104,245 @@ class GenerateMazeProcessor(BaseSheetProcessor):
             goal=goal,
         )
 
+        self.add_cells(3 * height * width)
         self._run_with_timer(
             "output_maze_result",
             output_maze_result,
             workbook=workbook,
             maze=maze,
             visit=visit,
+            render_mode=render_mode,
+            sheet_names=self._sheet_names(1),
         )
 
-        return workbook
+    def _process_batch(self, workbook, file_path, width, height, render_mode):
+        """
+        複数の迷路をワーカープロセスで生成・探索し、番号付きのシートへ出力
+
+        処理中のワークブックの迷路は、生成・探索の結果（numpy 配列）を受け取ってこのプロセスで描画します。
+        別のワークブックに分割する迷路は、描画・保存までワーカープロセスで行います。
+        """
+        count = self._count()
+        in_workbook = self._mazes_in_workbook()
+        seeds = _maze_seeds(self.config.get("seed"), count)
+        workers = self.config.get("workers", 0)
+        workers = min(workers if workers and workers > 0 else (os.cpu_count() or 1), count)
+        self.log(f"Generating {count} mazes ({width}x{height}) with {workers} worker(s)")
+
+        with (ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()) as executor:
+            submit = executor.submit if executor is not None else _run_now
+
+            # 別のワークブックに分割する迷路（生成から保存までワーカーで行う）
+            # 他の入力ファイルの出力と名前が重ならないよう、入力ファイルごとのディレクトリに保存する
+            split_dir = self._split_dir(file_path)
+            split_dir.mkdir(parents=True, exist_ok=True)
+            writer = self.context.output if self.context and self.context.output else OutputWriter()
+            digits = len(str((count - 1) // in_workbook + 1))
+            split_futures = []
+            for part, first in enumerate(range(in_workbook, count, in_workbook), 2):
+                last = min(first + in_workbook, count)
+                split_futures.append(submit(
+                    _write_maze_workbook,
+                    split_dir / f"maze_{part:0{digits}d}.xlsx",
+                    width,
+                    height,
+                    seeds[first:last],
+                    [self._sheet_names(index) for index in range(first + 1, last + 1)],
+                    render_mode,
+                    writer,
+                ))
+
+            # 処理中のワークブックの迷路（生成・探索はワーカー、描画はこのプロセス）
+            futures = [submit(_generate_and_solve, width, height, seed) for seed in seeds[:in_workbook]]
+            with self.span("output_maze_result"):
+                for index, future in enumerate(futures, 1):
+                    maze, visit = future.result()
+                    output_maze_result(workbook, maze, visit, render_mode, self._sheet_names(index))
+            self.add_cells(3 * height * width * in_workbook)
+
+            for future in split_futures:
+                split_file = future.result()
+                if self.context:
+                    self.context.extra_outputs.append(split_file)
+                self.log(f"Saved split workbook: {split_file.relative_to(split_dir.parent)}")
+
+    def _process_streaming(self, workbook, width, height, render_mode):
+        """
+        Eller 法で迷路を1行ずつ生成し、書き込み専用シートへ出力
+
+        メモリ使用量は迷路の高さに依存しないため、数十万行の迷路も生成できます。
+        出力したシートはセルを読み返せないため、後続のプロセッサーの対象外になります。
+        """
+        if self._splits_workbook():
+            raise ValueError("mazes_per_workbook is not supported with algorithm: eller")
+
+        count = self._count()
+        seeds = _maze_seeds(self.config.get("seed"), count)
+        for index, seed in enumerate(seeds, 1):
+            cost = self._run_with_timer(
+                "output_streaming_maze",
+                output_streaming_maze,
+                workbook=workbook,
+                width=width,
+                height=height,
+                seed=seed,
+                render_mode=render_mode,
+                sheet_names=self._sheet_names(index),
+                buffer_dir=self.config.get("buffer_dir"),
+            )
+            self.log(f"Maze {index}/{count}: {width}x{height}, shortest path {cost}")
+            self.add_cells(3 * height * width)
+
+    def _split_dir(self, file_path) -> Path:
+        """別のワークブックの保存先（ExcelProcessor から実行されていない場合は output/ の下。入力ディレクトリには保存しない）"""
+        output_dir = self.context.output_dir if self.context else Path("output")
+        return output_dir / Path(file_path).stem
+
+    def _count(self) -> int:
+        count = self.config.get("count", 1)
+        if count < 1:
+            raise ValueError("Maze count must be >= 1.")
+        return count
+
+    def _mazes_in_workbook(self) -> int:
+        """処理中のワークブックに出力する迷路の数"""
+        per_workbook = self.config.get("mazes_per_workbook")
+        return min(self._count(), per_workbook) if per_workbook else self._count()
+
+    def _splits_workbook(self) -> bool:
+        """処理中のワークブックに入りきらない迷路を、別のワークブックに分割するか"""
+        return self._mazes_in_workbook() < self._count()
+
+    def _sheet_names(self, index: int):
+        """index 番目（1始まり）の迷路を出力するシート名（Maze, Distance, Path の順）"""
+        return maze_sheet_names(index, self._count(), self.config.get("sheet_prefix", ""))
 
     def _run_with_timer(self, process_name, function, *args, **kwargs):
         start_time = datetime.now()
-        result = function(*args, **kwargs)
+        with self.span(process_name):
+            result = function(*args, **kwargs)
         end_time = datetime.now()
         elapsed_time = end_time - start_time
-        print(
-            f"[{self.__class__.__name__}][{process_name}] 処理時間: {elapsed_time}（{elapsed_time.total_seconds():.3f} 秒）"
-        )
+        self.log(f"[{process_name}] 処理時間: {elapsed_time}（{elapsed_time.total_seconds():.3f} 秒）")
         return result
 
 
-sys.setrecursionlimit(10**7)
+def maze_sheet_names(index, count, prefix=""):
+    """
+    index 番目（1始まり）の迷路を出力するシート名（Maze, Distance, Path の順）
+
+    count が 1 の場合は番号を付けない（例: "Maze"）、2以上の場合は桁数を揃えた番号を付ける（例: "Maze_001"）
+    """
+    if count == 1:
+        return tuple(f"{prefix}{name}" for name in OUTPUT_SHEETS)
+    digits = len(str(count))
+    return tuple(f"{prefix}{name}_{index:0{digits}d}" for name in OUTPUT_SHEETS)
 
 
-def generate_maze(width, height):
+def _maze_seeds(seed, count):
+    """
+    迷路ごとの乱数シード
+
+    1つの seed から互いに独立したシードを派生させるため、同じ seed と count なら
+    ワーカー数や処理順に関係なく同じ迷路の組になる
+    """
+    if count == 1:
+        return [seed]
+    return np.random.SeedSequence(seed).spawn(count)
+
+
+def _run_now(function, *args):
+    """ProcessPoolExecutor.submit と同じ形で、関数をその場で実行する（逐次処理用）"""
+    future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _generate_and_solve(width, height, seed):
+    """迷路を生成して探索し、(迷路の配列, 探索結果) を返す（ワーカープロセスで実行）"""
+    maze, start, goal = generate_maze(width=width, height=height, seed=seed)
+    return maze, solver(maze=maze, start=start, goal=goal)
+
+
+def _write_maze_workbook(output_file, width, height, seeds, sheet_names, render_mode, writer):
+    """迷路を生成・探索して新しいワークブックへ描画し、保存する（ワーカープロセスで実行）"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for seed, names in zip(seeds, sheet_names):
+        maze, visit = _generate_and_solve(width, height, seed)
+        output_maze_result(workbook, maze, visit, render_mode, names)
+    with atomic_output(output_file) as tmp_file:
+        writer.save(workbook, tmp_file)
+    return output_file
+
+
+def generate_maze(width, height, seed=None):
     """
     width  : 迷路の横幅（奇数を推奨）
     height : 迷路の高さ（奇数を推奨）
-    return : 迷路 2D 配列（壁=1, 道=0）、start座標、goal座標
+    seed   : 乱数シード（None の場合は毎回異なる迷路）
+    return : 迷路 2D 配列（uint8 の numpy 配列、壁=1, 道=0）、start座標、goal座標
     """
 
     _validate_maze_size(width, height)
 
-    maze = [[1 for _ in range(width)] for _ in range(height)]
+    rng = np.random.default_rng(seed)
+    size = width * height
 
-    # 開始位置（ランダムな奇数座標）
-    start_x = random.randrange(1, width, 2)
-    start_y = random.randrange(1, height, 2)
-    maze[start_y][start_x] = 0
+    # 1次元の bytearray 上で穴掘り法を行う（再帰を使わず明示的なスタックで探索）
+    grid = bytearray(b"\x01") * size
 
-    # 移動方向
-    directions = [(0, 2), (0, -2), (2, 0), (-2, 0)]
+    # 掘り進められるセル（内側の奇数座標）
+    carvable = np.zeros((height, width), dtype=np.uint8)
+    carvable[1:height - 1:2, 1:width - 1:2] = 1
+    carvable = carvable.tobytes()
 
-    def carve(x, y):
-        random.shuffle(directions)
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 < nx < width-1 and 0 < ny < height-1:
-                if maze[ny][nx] == 1:
-                    maze[ny - dy // 2][nx - dx // 2] = 0
-                    maze[ny][nx] = 0
-                    carve(nx, ny)
+    # 移動方向（2マス先のオフセット）と方向の並び順 24 通り
+    steps = (2, -2, 2 * width, -2 * width)
+    orders = [tuple(steps[i] for i in order) for order in itertools.permutations(range(4))]
 
-    carve(start_x, start_y)
+    # 開始位置（ランダムな奇数座標）
+    start_x = int(rng.integers(0, (width - 1) // 2)) * 2 + 1
+    start_y = int(rng.integers(0, (height - 1) // 2)) * 2 + 1
+    first = start_y * width + start_x
+    grid[first] = 0
+
+    # 各セルを訪れた時の方向の並び順を事前に乱数で決めておく
+    order_of = rng.integers(0, len(orders), size=size, dtype=np.uint8).tobytes()
+    tried = bytearray(size)
+
+    stack = [first]
+    while stack:
+        now = stack[-1]
+        k = tried[now]
+        if k == 4:
+            stack.pop()
+            continue
+        tried[now] = k + 1
+
+        step = orders[order_of[now]][k]
+        nxt = now + step
+        if 0 <= nxt < size and carvable[nxt] and grid[nxt]:
+            grid[now + step // 2] = 0
+            grid[nxt] = 0
+            stack.append(nxt)
+
+    maze = np.frombuffer(grid, dtype=np.uint8).reshape(height, width).copy()
 
     # --------------------------------------
     # Start と Goal の決定
     # --------------------------------------
+    passages = np.flatnonzero(maze == 0)
 
     # Start = 左上の最初の通路
-    start_coord = None
-    for y in range(height):
-        for x in range(width):
-            if maze[y][x] == 0:
-                start_coord = (x, y)
-                break
-        if start_coord:
-            break
-
+    start_y, start_x = divmod(int(passages[0]), width)
     # Goal = 右下の最後の通路
-    goal_coord = None
-    for y in range(height - 1, -1, -1):
-        for x in range(width - 1, -1, -1):
-            if maze[y][x] == 0:
-                goal_coord = (x, y)
-                break
-        if goal_coord:
-            break
+    goal_y, goal_x = divmod(int(passages[-1]), width)
 
-    return maze, start_coord, goal_coord
+    return maze, (start_x, start_y), (goal_x, goal_y)
 
 
 def _validate_maze_size(width: int, height: int):
@@ -150,34 +370,24 @@ def print_maze(maze, start, goal):
 
 
 
-class State:
-    def __init__(self, xy, cost):
-        self._xy = xy
-        self._cost = cost
-
-    def get_position(self):
-        return self._xy
+# 親セルへの移動方向（1始まりのコード、0=未設定）
+_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
 
-    def get_cost(self):
-        return self._cost
-
-    def get_next_state(self, dx_dy):
-        return State(
-            (self._xy[0] + dx_dy[0], self._xy[1] + dx_dy[1]),
-            self._cost + 1
-        )
 
+class Visit:
+    """
+    幅優先探索の結果（Start からの距離と親方向）を保持するクラス
 
+    距離は int32 配列、親セルは 1 バイトの方向コード配列で管理する。
+    """
 
-class Visit:
     def __init__(self, maze, start, goal):
-        self._start = start
-        self._goal = goal
-        self._height = len(maze)
-        self._width = len(maze[0])
-        self._visit = [[-1 for _ in range(self._width)] for _ in range(self._height)]
-        self._path = [[(-1, -1) for _ in range(self._width)] for _ in range(self._height)]
-        self._maze = maze
+        self._start = tuple(start)
+        self._goal = tuple(goal)
+        self._maze = np.asarray(maze, dtype=np.uint8)
+        self._height, self._width = self._maze.shape
+        self._visit = np.full((self._height, self._width), -1, dtype=np.int32)
+        self._path = np.zeros((self._height, self._width), dtype=np.uint8)
 
     @property
     def start(self):
@@ -188,183 +398,599 @@ class Visit:
         return self._goal
 
     def get_cost(self, xy):
-        return self._visit[xy[1]][xy[0]]
+        return int(self._visit[xy[1], xy[0]])
+
+    def can_move(self, xy):
+        return (
+            0 <= xy[1] < self._height
+            and 0 <= xy[0] < self._width
+            and self._maze[xy[1], xy[0]] != 1
+        )
 
-    def set_cost(self, state):
-        xy = state.get_position()
-        cost = state.get_cost()
-        if not self.can_move(xy):
-            raise ValueError(f"Invalid position {xy}. Out of bounds or wall.")
-        self._visit[xy[1]][xy[0]] = cost
+    def solve(self):
+        """Start から幅優先探索を行い、距離と親方向を記録する"""
+        if not self.can_move(self._start):
+            raise ValueError(f"Invalid position {self._start}. Out of bounds or wall.")
 
-    def set_path(self, now_state, next_state):
-        now_xy = now_state.get_position()
-        next_xy = next_state.get_position()
-        self._path[next_xy[1]][next_xy[0]] = now_xy
+        # 周囲を壁で囲んだ 1 次元配列上で探索し、境界チェックを省く
+        padded_width = self._width + 2
+        walls = np.pad(self._maze == 1, 1, constant_values=True).tobytes()
+        size = len(walls)
+        dist = array("i", [-1]) * size
+        parent = bytearray(size)
 
-    def update(self, now_state, next_state):
-        self.set_cost(next_state)
-        self.set_path(now_state, next_state)
+        sx, sy = self._start
+        _bfs(walls, padded_width, (sy + 1) * padded_width + sx + 1, dist, parent)
 
-    def get_start_to_goal_path(self):
-        path = []
-        goal = tuple(self._goal)
-        start = tuple(self._start)
+        inner = (slice(1, -1), slice(1, -1))
+        shape = (self._height + 2, padded_width)
+        self._visit = np.frombuffer(dist, dtype=np.int32).reshape(shape)[inner].copy()
+        self._path = np.frombuffer(parent, dtype=np.uint8).reshape(shape)[inner].copy()
 
+    def get_start_to_goal_path(self):
+        gx, gy = self._goal
         # 目標が未到達
-        if self._path[goal[1]][goal[0]] == (-1, -1) and goal != start:
-            return path
+        if self._visit[gy, gx] < 0:
+            return []
 
-        now = goal
-        while now != (-1, -1):
-            path.append(now)
-            if now == start:
-                break
-            now = self._path[now[1]][now[0]]
+        path = [(gx, gy)]
+        x, y = gx, gy
+        while (x, y) != self._start:
+            dx, dy = _DIRECTIONS[self._path[y, x] - 1]
+            x, y = x - dx, y - dy
+            path.append((x, y))
 
         return list(reversed(path))
-        
-    def can_move(self, xy):
-        return (
-            0 <= xy[1] < self._height
-            and 0 <= xy[0] < self._width
-            and self._maze[xy[1]][xy[0]] != 1
-        )
 
     def print_visit(self):
         for value in self._visit:
-            print(value)
-
-    def try_move(self, now_state, next_state):
-        """
-        now_state から next_state への遷移が有効で未訪問なら更新する
-        戻り値: True=更新した, False=スキップ
-        """
-        next_xy = next_state.get_position()
-        if (not self.can_move(next_xy)) or self.get_cost(next_xy) >= 0:
-            return False
-        self.update(now_state, next_state)
-        return True
+            print(value.tolist())
 
     def get_visit_map(self):
-        """訪問コストの2次元配列を返す（内部参照をそのまま返すので編集しないこと）"""
+        """訪問コストの2次元配列（int32、未到達・壁は -1）を返す（内部参照をそのまま返すので編集しないこと）"""
         return self._visit
-            
 
 
-def solver(maze, start, goal):
-    visit = Visit(maze, start, goal)
-    directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-    
-    queue = deque()
-    start_state = State(start, 0)
-    visit.set_cost(start_state)
-    queue.append(start_state)
+def _bfs(walls, width, start, dist, parent):
+    """
+    1 次元インデックス上の幅優先探索
+
+    walls  : 壁なら真となるバイト列（外周は壁であること）
+    width  : 1 行あたりの要素数
+    start  : 開始位置のインデックス
+    dist   : 距離の書き込み先（-1 で初期化済み）
+    parent : 親への方向コードの書き込み先（0 で初期化済み）
+    """
+    offsets = tuple(dx + dy * width for dx, dy in _DIRECTIONS)
+    moves = tuple(enumerate(offsets, 1))
+
+    dist[start] = 0
+    queue = deque([start])
+    popleft = queue.popleft
+    append = queue.append
     while queue:
-        now_state = queue.popleft()
+        now = popleft()
+        cost = dist[now] + 1
+        for code, offset in moves:
+            nxt = now + offset
+            if not walls[nxt] and dist[nxt] < 0:
+                dist[nxt] = cost
+                parent[nxt] = code
+                append(nxt)
+
 
-        for dx_dy in directions:
-            next_state = now_state.get_next_state(dx_dy)
-            if visit.try_move(now_state, next_state):
-                queue.append(next_state)
-    
+def solver(maze, start, goal):
+    visit = Visit(maze, start, goal)
+    visit.solve()
     return visit
 
 
-def output_maze_result(workbook, maze, visit):
+# 出力するシート名
+OUTPUT_SHEETS = ("Maze", "Distance", "Path")
+
+# 距離ヒートマップの色数（コストをこの段階数に量子化して書式を共有する）
+HEATMAP_LEVELS = 32
+
+# 出力方法: styled=セルごとに書式を設定, conditional=値のみ書き込み条件付き書式で色付け
+RENDER_MODES = ("styled", "conditional")
+
+# セル書式のキー
+_NEUTRAL, _WALL, _START, _GOAL, _PATH = range(5)
+
+# 条件付き書式モードで壁を表す値
+_WALL_MARK = "#"
+
+
+def output_maze_result(workbook, maze, visit, render_mode="styled", sheet_names=OUTPUT_SHEETS):
     """
     迷路、距離マップ、最短経路をそれぞれ別シートに出力する
-    """
-    sheet_names = ("Maze", "Distance", "Path")
 
+    sheet_names : 出力するシート名（Maze, Distance, Path の順）
+    """
     for sheet_name in sheet_names:
         if sheet_name in workbook.sheetnames:
             del workbook[sheet_name]
+    maze_name, distance_name, path_name = sheet_names
+
+    maze = np.asarray(maze, dtype=np.uint8)
+    if render_mode == "conditional":
+        _output_conditional(workbook, maze, visit, sheet_names)
+        return
+
+    (sx, sy), (gx, gy) = visit.start, visit.goal
 
-    wall_fill = PatternFill(fill_type="solid", fgColor="404040")
-    start_fill = PatternFill(fill_type="solid", fgColor="4CAF50")
-    goal_fill = PatternFill(fill_type="solid", fgColor="F44336")
-    path_fill = PatternFill(fill_type="solid", fgColor="FFD54F")
     text_center = Alignment(horizontal="center", vertical="center")
     bold_font = Font(bold=True)
-    neutral_fill = PatternFill(fill_type="solid", fgColor="FFFFFF")
     num_font = Font(color="0F172A")
-    cell_size = 3  # おおよそ正方形に見える幅・高さ（単位: Excel の列幅/行高さ単位）
+
+    # 後続のプロセッサー（FormatProcessor、SummarySheetProcessor の列の統計情報、シートの書き出しなど）が
+    # セルを読み返せるよう、書き込み専用シート（StreamedWorksheet）ではなく通常のシートへ書き込む
+    # （セルを読み返せなくてもメモリ使用量を抑えたい場合は algorithm: eller を使う）
 
     # Maze シート
-    maze_ws = workbook.create_sheet("Maze")
-    maze_ws.sheet_view.showGridLines = False
-    for y, row in enumerate(maze):
-        for x, cell in enumerate(row):
-            c = maze_ws.cell(row=y + 1, column=x + 1)
-            if (x, y) == visit.start:
-                c.value = "S"
-                c.fill = start_fill
-                c.font = bold_font
-            elif (x, y) == visit.goal:
-                c.value = "G"
-                c.fill = goal_fill
-                c.font = bold_font
-            else:
-                c.value = ""
-                c.fill = wall_fill if cell else neutral_fill
-            c.alignment = text_center
-    for col in range(1, len(maze[0]) + 1):
-        maze_ws.column_dimensions[get_column_letter(col)].width = cell_size
-    for row_idx in range(1, len(maze) + 1):
-        maze_ws.row_dimensions[row_idx].height = cell_size * 5  # 行高さは幅より大きめ係数
+    maze_ws = _create_grid_sheet(workbook, maze_name, maze.shape)
+
+    # 書式は種類ごとに一度だけ登録し、全セルで共有する
+    styles = [
+        _style_array(maze_ws, fill_color="FFFFFF", alignment=text_center),
+        _style_array(maze_ws, fill_color="404040", alignment=text_center),
+        _style_array(maze_ws, fill_color="4CAF50", font=bold_font, alignment=text_center),
+        _style_array(maze_ws, fill_color="F44336", font=bold_font, alignment=text_center),
+        _style_array(maze_ws, fill_color="FFD54F", font=num_font, alignment=text_center),
+    ]
+
+    keys = np.where(maze == 1, _WALL, _NEUTRAL)
+    keys[sy, sx] = _START
+    keys[gy, gx] = _GOAL
+    values = np.full(maze.shape, None, dtype=object)
+    values[sy, sx] = "S"
+    values[gy, gx] = "G"
+    _write_grid(maze_ws, values, keys, styles)
 
     # Distance シート
-    dist_ws = workbook.create_sheet("Distance")
-    dist_ws.sheet_view.showGridLines = False
+    dist_ws = _create_grid_sheet(workbook, distance_name, maze.shape)
     visit_map = visit.get_visit_map()
-    max_cost = max(max(row) for row in visit_map if row) or 0
-    for y, row in enumerate(visit_map):
-        for x, cost in enumerate(row):
-            c = dist_ws.cell(row=y + 1, column=x + 1, value=cost)
-            c.alignment = text_center
-            c.font = num_font
-            if cost >= 0 and max_cost > 0:
-                # 簡易ヒートマップ: コストに応じて薄い青から濃い青へ
-                intensity = int(255 - (cost / max_cost) * 120)
-                hex_part = f"{intensity:02X}"
-                c.fill = PatternFill(fill_type="solid", fgColor=f"BB{hex_part}FF")
-            else:
-                c.fill = wall_fill
-    for col in range(1, len(maze[0]) + 1):
-        dist_ws.column_dimensions[get_column_letter(col)].width = cell_size
-    for row_idx in range(1, len(maze) + 1):
-        dist_ws.row_dimensions[row_idx].height = cell_size * 5
+    max_cost = int(visit_map.max()) if visit_map.size else 0
+
+    # 簡易ヒートマップ: コストに応じて薄い青から濃い青へ（HEATMAP_LEVELS 段階）
+    heatmap_styles = [_style_array(dist_ws, fill_color="404040", font=num_font, alignment=text_center)]
+    for level in range(HEATMAP_LEVELS):
+        intensity = int(255 - (level / (HEATMAP_LEVELS - 1)) * 120)
+        heatmap_styles.append(
+            _style_array(dist_ws, fill_color=f"BB{intensity:02X}FF", font=num_font, alignment=text_center)
+        )
+
+    if max_cost > 0:
+        levels = np.rint(visit_map * ((HEATMAP_LEVELS - 1) / max_cost)).astype(np.int64) + 1
+        dist_keys = np.where(visit_map >= 0, levels, 0)
+    else:
+        dist_keys = np.zeros(visit_map.shape, dtype=np.int64)
+    _write_grid(dist_ws, visit_map, dist_keys, heatmap_styles)
 
     # Path シート
-    path_ws = workbook.create_sheet("Path")
-    path_ws.sheet_view.showGridLines = False
-    path = visit.get_start_to_goal_path()
-    step_lookup = {xy: idx for idx, xy in enumerate(path)}
-    for y, row in enumerate(maze):
-        for x, cell in enumerate(row):
-            coord = (x, y)
-            c = path_ws.cell(row=y + 1, column=x + 1)
-            if coord == visit.start:
-                c.value = "S"
-                c.fill = start_fill
-                c.font = bold_font
-            elif coord == visit.goal:
-                c.value = "G"
-                c.fill = goal_fill
-                c.font = bold_font
-            elif coord in step_lookup:
-                c.value = step_lookup[coord]
-                c.fill = path_fill
-                c.font = num_font
-            elif cell == 1:
-                c.value = ""
-                c.fill = wall_fill
-            else:
-                c.value = ""
-                c.fill = neutral_fill
-            c.alignment = text_center
-    for col in range(1, len(maze[0]) + 1):
-        path_ws.column_dimensions[get_column_letter(col)].width = cell_size
-    for row_idx in range(1, len(maze) + 1):
-        path_ws.row_dimensions[row_idx].height = cell_size * 5
+    path_ws = _create_grid_sheet(workbook, path_name, maze.shape)
+    path_keys = np.where(maze == 1, _WALL, _NEUTRAL)
+    path_values = np.full(maze.shape, None, dtype=object)
+    for step, (x, y) in enumerate(visit.get_start_to_goal_path()):
+        path_keys[y, x] = _PATH
+        path_values[y, x] = step
+    path_keys[sy, sx] = _START
+    path_keys[gy, gx] = _GOAL
+    path_values[sy, sx] = "S"
+    path_values[gy, gx] = "G"
+    _write_grid(path_ws, path_values, path_keys, styles)
+
+
+def _output_conditional(workbook, maze, visit, sheet_names=OUTPUT_SHEETS):
+    """
+    値のみを書き込み、色付けは使用範囲全体への条件付き書式で表現する
+
+    セルの値は styled モードと同じ（距離マップの壁・未到達は -1）で、Maze / Path シートの壁だけが
+    空セルではなく "#"（条件付き書式で文字色を背景色と同じにして非表示）になる。
+    中央揃えは値のあるセルだけに、1つだけ登録した書式を共有して設定する
+    （列の書式は値のあるセルには適用されないため）。
+    """
+    (sx, sy), (gx, gy) = visit.start, visit.goal
+    maze_name, distance_name, path_name = sheet_names
+
+    # Maze シート
+    maze_ws = _create_grid_sheet(workbook, maze_name, maze.shape)
+    _add_conditional_rules(maze_ws, "Maze", maze.shape)
+    center = _style_array(maze_ws, alignment=Alignment(horizontal="center", vertical="center"))
+    values = np.where(maze == 1, _WALL_MARK, None)
+    values[sy, sx] = "S"
+    values[gy, gx] = "G"
+    _append_sparse(maze_ws, values, center)
+
+    # Distance シート（壁・未到達は -1）
+    dist_ws = _create_grid_sheet(workbook, distance_name, maze.shape)
+    _add_conditional_rules(dist_ws, "Distance", maze.shape)
+    _append_sparse(dist_ws, visit.get_visit_map(), center)
+
+    # Path シート
+    path_ws = _create_grid_sheet(workbook, path_name, maze.shape)
+    _add_conditional_rules(path_ws, "Path", maze.shape)
+    path_values = np.where(maze == 1, _WALL_MARK, None)
+    for step, (x, y) in enumerate(visit.get_start_to_goal_path()):
+        path_values[y, x] = step
+    path_values[sy, sx] = "S"
+    path_values[gy, gx] = "G"
+    _append_sparse(path_ws, path_values, center)
+
+
+def _add_conditional_rules(ws, kind, shape):
+    """
+    条件付き書式モードの色付けルールを使用範囲全体に追加する
+
+    kind : "Maze" / "Distance" / "Path"（OUTPUT_SHEETS のいずれか）
+    """
+    height, width = shape
+    cell_range = f"A1:{get_column_letter(width)}{height}"
+
+    if kind == "Distance":
+        wall_fill = PatternFill(fill_type="solid", start_color="404040", end_color="404040")
+        ws.conditional_formatting.add(
+            cell_range, FormulaRule(formula=["A1<0"], fill=wall_fill, stopIfTrue=True)
+        )
+        ws.conditional_formatting.add(
+            cell_range,
+            ColorScaleRule(start_type="num", start_value=0, start_color="BBFFFF", end_type="max", end_color="BB87FF"),
+        )
+        return
+
+    # 左上セル基準の相対参照で、範囲内の各セルに評価される
+    rules = (
+        ('A1="S"', "4CAF50", Font(bold=True)),
+        ('A1="G"', "F44336", Font(bold=True)),
+        (f'A1="{_WALL_MARK}"', "404040", Font(color="404040")),
+    )
+    for formula, color, font in rules:
+        fill = PatternFill(fill_type="solid", start_color=color, end_color=color)
+        ws.conditional_formatting.add(
+            cell_range, FormulaRule(formula=[formula], fill=fill, font=font, stopIfTrue=True)
+        )
+
+    if kind == "Path":
+        path_fill = PatternFill(fill_type="solid", start_color="FFD54F", end_color="FFD54F")
+        ws.conditional_formatting.add(
+            cell_range, FormulaRule(formula=["ISNUMBER(A1)"], fill=path_fill, font=Font(color="0F172A"))
+        )
+
+
+def _append_sparse(ws, values, style=None):
+    """
+    None 以外の値だけをセルとして作成し、行単位でシートへ追加する
+
+    style : 値のあるセルに設定する StyleArray（_style_array で作成したもの、None の場合は書式なし）
+    """
+    if is_streamed(ws):
+        # 書き込み専用シートは None のセルを書き出さない
+        for row in values.tolist():
+            if style is not None:
+                row = [None if value is None else Cell(ws, value=value, style_array=style) for value in row]
+            ws.append(row)
+        return
+    for row in values.tolist():
+        cells = {column: value for column, value in enumerate(row, 1) if value is not None}
+        ws.append(cells)
+        if style is not None:
+            row_idx = ws._current_row
+            for column in cells:
+                ws._cells[(row_idx, column)]._style = copy(style)
+
+
+def _create_grid_sheet(workbook, sheet_name, shape, streamed=False):
+    """
+    全セルを同じ大きさで表示するシートを作成する
+
+    行・列ごとの寸法は設定せず、シート既定値と列範囲 1 件だけで指定する。
+    streamed=True の場合は、行を順に一時ファイルへ書き出す書き込み専用シートを作成する。
+    """
+    height, width = shape
+    cell_size = 3  # おおよそ正方形に見える幅・高さ（単位: Excel の列幅/行高さ単位）
+
+    ws = create_streamed_sheet(workbook, sheet_name) if streamed else workbook.create_sheet(sheet_name)
+    ws.sheet_view.showGridLines = False
+
+    columns = ws.column_dimensions["A"]
+    columns.min, columns.max = 1, width
+    columns.width = cell_size
+
+    ws.sheet_format.defaultRowHeight = cell_size * 5  # 行高さは幅より大きめ係数
+    ws.sheet_format.customHeight = True
+    return ws
+
+
+def _style_array(ws, fill_color=None, font=None, alignment=None):
+    """書式をワークブックに登録し、セル間で共有できる StyleArray を返す"""
+    template = Cell(ws)
+    if fill_color is not None:
+        template.fill = PatternFill(fill_type="solid", fgColor=fill_color)
+    if font is not None:
+        template.font = font
+    if alignment is not None:
+        template.alignment = alignment
+    return copy(template._style)
+
+
+def _write_grid(ws, values, keys, styles):
+    """
+    2 次元配列の値と書式キーをまとめてシートへ書き込む
+
+    values : セル値の 2 次元配列
+    keys   : styles のインデックスを表す 2 次元配列
+    styles : _style_array で作成した StyleArray のリスト
+    """
+    for value_row, key_row in zip(values.tolist(), keys.tolist()):
+        ws.append([
+            Cell(ws, value=value, style_array=styles[key])
+            for value, key in zip(value_row, key_row)
+        ])
+
+
+# --------------------------------------
+# Eller 法による1行ずつの生成（定数メモリ）
+# --------------------------------------
+
+# 生成アルゴリズム: backtracker=穴掘り法（全体をメモリ上で生成）, eller=Eller 法（1行ずつ生成して書き込み専用シートへ出力）
+ALGORITHMS = ("backtracker", "eller")
+
+# 書き込み専用シートへ一度に描画する行数
+_STREAM_BLOCK_ROWS = 256
+
+# 最短経路上のセルを表す印（親方向コードの領域に上書きする）
+_ON_PATH = 0xFF
+
+# Excel のシートの最大行数・最大列数
+_MAX_ROWS = 1_048_576
+_MAX_COLUMNS = 16_384
+
+
+def generate_maze_rows(width, height, seed=None):
+    """
+    Eller 法で迷路を上から1行ずつ生成する（保持するのは1行分の集合番号のみ）
+
+    width  : 迷路の横幅（奇数）
+    height : 迷路の高さ（奇数）
+    seed   : 乱数シード（None の場合は毎回異なる迷路）
+    yield  : 1行分の bytes（壁=1, 道=0）
+    """
+    _validate_maze_size(width, height)
+
+    rng = np.random.default_rng(seed)
+    columns = (width - 1) // 2
+    rows = (height - 1) // 2
+
+    wall_row = b"\x01" * width
+    cell_row = bytearray(wall_row)
+    cell_row[1:width - 1:2] = bytes(columns)
+
+    # 各セルが属する集合の番号（同じ集合のセルは既に通路でつながっている）
+    sets = list(range(columns))
+    next_set = columns
+
+    yield wall_row
+    for row_index in range(rows):
+        last = row_index == rows - 1
+        line = bytearray(cell_row)
+
+        members = {}
+        for column, set_id in enumerate(sets):
+            members.setdefault(set_id, []).append(column)
+
+        # 横方向: 異なる集合の隣接セルをランダムにつなぐ（最終行はすべてつなぐ）
+        joins = [True] * (columns - 1) if last else (rng.random(columns - 1) < 0.5).tolist()
+        for column, join in enumerate(joins):
+            left, right = sets[column], sets[column + 1]
+            if left == right or not join:
+                continue
+            line[2 * column + 2] = 0
+            # 要素数の少ない集合を多い集合へ統合する
+            if len(members[left]) < len(members[right]):
+                left, right = right, left
+            for member in members[right]:
+                sets[member] = left
+            members[left].extend(members.pop(right))
+        yield bytes(line)
+
+        if last:
+            break
+
+        # 縦方向: 各集合から少なくとも1つのセルを下の行へつなぐ
+        down = (rng.random(columns) < 0.5).tolist()
+        picks = rng.integers(0, columns, size=columns).tolist()
+        below = bytearray(wall_row)
+        next_sets = [-1] * columns
+        for set_id, member_columns in members.items():
+            chosen = [column for column in member_columns if down[column]]
+            if not chosen:
+                chosen = [member_columns[picks[member_columns[0]] % len(member_columns)]]
+            for column in chosen:
+                below[2 * column + 1] = 0
+                next_sets[column] = set_id
+
+        # 下へつながらなかったセルは新しい集合になる
+        for column in range(columns):
+            if next_sets[column] < 0:
+                next_sets[column] = next_set
+                next_set += 1
+        sets = next_sets
+        yield bytes(below)
+    yield wall_row
+
+
+class _MazeBuffers:
+    """
+    探索に使う壁・距離・親方向を一時ファイルにメモリマップして保持するクラス
+
+    1セルあたり 6 バイト（壁 1 + 距離 4 + 親方向 1）をディスク上に確保し、
+    必要な部分だけがページキャッシュに読み込まれる。
+    """
+
+    def __init__(self, width, height, buffer_dir=None):
+        self.width = width
+        self.height = height
+        self._directory = tempfile.TemporaryDirectory(prefix="maze_", dir=buffer_dir)
+        size = width * height
+        self.walls = self._map("walls", size)
+        self.dist = self._map("dist", size * 4)
+        self.parent = self._map("parent", size)
+
+    def _map(self, name, size):
+        with open(os.path.join(self._directory.name, name), "w+b") as f:
+            f.truncate(size)
+            return mmap.mmap(f.fileno(), size)
+
+    def grid(self, buffer, dtype=np.uint8):
+        """バッファの (height, width) の numpy ビュー（コピーしない）"""
+        return np.frombuffer(buffer, dtype=dtype).reshape(self.height, self.width)
+
+    def close(self):
+        for buffer in (self.walls, self.dist, self.parent):
+            try:
+                buffer.close()
+            except BufferError:
+                # 例外の発生中などでビューが残っている場合は、ガベージコレクションに任せる
+                pass
+        self._directory.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def output_streaming_maze(
+    workbook, width, height, seed=None, render_mode="styled", sheet_names=OUTPUT_SHEETS, buffer_dir=None
+):
+    """
+    Eller 法で迷路を生成し、迷路、距離マップ、最短経路を書き込み専用シートへ出力する
+
+    メモリ上に保持するのは O(width) の状態と描画中のブロック（_STREAM_BLOCK_ROWS 行）だけで、
+    探索に使う壁・距離・親方向は buffer_dir（None の場合は一時ディレクトリ）のファイルにメモリマップする。
+    Start は左上、Goal は右下のセル。
+
+    return : 最短経路の長さ（Start から Goal までの距離）
+    """
+    if height > _MAX_ROWS or width > _MAX_COLUMNS:
+        raise ValueError(f"Maze size must be <= {_MAX_ROWS} rows and <= {_MAX_COLUMNS} columns.")
+
+    for sheet_name in sheet_names:
+        if sheet_name in workbook.sheetnames:
+            del workbook[sheet_name]
+
+    start, goal = (1, 1), (width - 2, height - 2)
+    start_index = start[1] * width + start[0]
+    goal_index = goal[1] * width + goal[0]
+
+    with _MazeBuffers(width, height, buffer_dir) as buffers:
+        # 迷路を1行ずつ生成してバッファへ書き込む
+        offset = 0
+        for row in generate_maze_rows(width, height, seed):
+            buffers.walls[offset:offset + width] = row
+            offset += width
+
+        # 幅優先探索（外周は必ず壁なので、そのまま1次元インデックスで探索できる）
+        dist = memoryview(buffers.dist).cast("i")
+        try:
+            buffers.grid(buffers.dist, np.int32).fill(-1)
+            _bfs(buffers.walls, width, start_index, dist, buffers.parent)
+            goal_cost = dist[goal_index]
+
+            # Goal から親方向をたどり、最短経路上のセルに印を付ける
+            # （最短経路上のセルの歩数は Start からの距離と等しいため、歩数は保持しない）
+            offsets = (0,) + tuple(dx + dy * width for dx, dy in _DIRECTIONS)
+            now = goal_index
+            while now != start_index:
+                code = buffers.parent[now]
+                buffers.parent[now] = _ON_PATH
+                now -= offsets[code]
+            buffers.parent[start_index] = _ON_PATH
+        finally:
+            dist.release()
+
+        _render_streaming_sheets(workbook, buffers, start, goal, goal_cost, render_mode, sheet_names)
+
+    return goal_cost
+
+
+def _render_streaming_sheets(workbook, buffers, start, goal, goal_cost, render_mode, sheet_names):
+    """メモリマップしたバッファをブロック単位で読み、3つの書き込み専用シートへ描画する"""
+    shape = (buffers.height, buffers.width)
+    maze_ws, dist_ws, path_ws = (_create_grid_sheet(workbook, name, shape, streamed=True) for name in sheet_names)
+
+    walls = buffers.grid(buffers.walls)
+    dist = buffers.grid(buffers.dist, np.int32)
+    parent = buffers.grid(buffers.parent)
+
+    text_center = Alignment(horizontal="center", vertical="center")
+    if render_mode == "conditional":
+        for ws, kind in zip((maze_ws, dist_ws, path_ws), OUTPUT_SHEETS):
+            _add_conditional_rules(ws, kind, shape)
+        center = _style_array(maze_ws, alignment=text_center)
+    else:
+        bold_font = Font(bold=True)
+        num_font = Font(color="0F172A")
+        styles = [
+            _style_array(maze_ws, fill_color="FFFFFF", alignment=text_center),
+            _style_array(maze_ws, fill_color="404040", alignment=text_center),
+            _style_array(maze_ws, fill_color="4CAF50", font=bold_font, alignment=text_center),
+            _style_array(maze_ws, fill_color="F44336", font=bold_font, alignment=text_center),
+            _style_array(maze_ws, fill_color="FFD54F", font=num_font, alignment=text_center),
+        ]
+        heatmap_styles = [_style_array(dist_ws, fill_color="404040", font=num_font, alignment=text_center)]
+        for level in range(HEATMAP_LEVELS):
+            intensity = int(255 - (level / (HEATMAP_LEVELS - 1)) * 120)
+            heatmap_styles.append(
+                _style_array(dist_ws, fill_color=f"BB{intensity:02X}FF", font=num_font, alignment=text_center)
+            )
+        # 完全迷路では全通路が到達可能なので、最大距離はブロックごとの最大値から求める
+        max_cost = max(
+            int(dist[top:top + _STREAM_BLOCK_ROWS].max()) for top in range(0, buffers.height, _STREAM_BLOCK_ROWS)
+        )
+
+    for top in range(0, buffers.height, _STREAM_BLOCK_ROWS):
+        rows = slice(top, min(top + _STREAM_BLOCK_ROWS, buffers.height))
+        maze_block = walls[rows]
+        dist_block = dist[rows]
+        on_path = parent[rows] == _ON_PATH
+
+        # ブロック内での Start / Goal の位置（ブロック外なら None）
+        marks = [
+            (y - top, x, mark) for (x, y), mark in ((start, "S"), (goal, "G"))
+            if rows.start <= y < rows.stop
+        ]
+
+        if render_mode == "conditional":
+            maze_values = np.where(maze_block == 1, _WALL_MARK, None)
+            path_values = np.where(on_path, dist_block, maze_values)
+            for y, x, mark in marks:
+                maze_values[y, x] = mark
+                path_values[y, x] = mark
+            _append_sparse(maze_ws, maze_values, center)
+            _append_sparse(dist_ws, dist_block, center)
+            _append_sparse(path_ws, path_values, center)
+            continue
+
+        keys = np.where(maze_block == 1, _WALL, _NEUTRAL)
+        path_keys = np.where(on_path, _PATH, keys)
+        maze_values = np.full(maze_block.shape, None, dtype=object)
+        path_values = np.where(on_path, dist_block, None)
+        for y, x, mark in marks:
+            key = _START if mark == "S" else _GOAL
+            keys[y, x] = path_keys[y, x] = key
+            maze_values[y, x] = path_values[y, x] = mark
+        _write_grid(maze_ws, maze_values, keys, styles)
+
+        if max_cost > 0:
+            levels = np.rint(dist_block * ((HEATMAP_LEVELS - 1) / max_cost)).astype(np.int64) + 1
+            dist_keys = np.where(dist_block >= 0, levels, 0)
+        else:
+            dist_keys = np.zeros(dist_block.shape, dtype=np.int64)
+        _write_grid(dist_ws, dist_block, dist_keys, heatmap_styles)
+
+        _write_grid(path_ws, path_values, path_keys, styles)
+
+    # numpy のビューを解放してからバッファを閉じる
+    del walls, dist, parent, maze_block, dist_block, on_path
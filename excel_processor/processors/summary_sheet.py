@@ -3,7 +3,9 @@
 from datetime import datetime
 from openpyxl.workbook import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
 from excel_processor.base_processor import BaseSheetProcessor
+from excel_processor.streamed_sheet import is_streamed
 
 
 class SummarySheetProcessor(BaseSheetProcessor):
@@ -13,11 +15,26 @@ class SummarySheetProcessor(BaseSheetProcessor):
     設定例:
         sheet_name: "Summary"  # シート名（デフォルト: "Summary"）
         position: 0  # シートの位置（0=先頭、デフォルト: 0）
+        column_stats: true  # 列ごとの統計情報（型・件数・最小/最大/合計）を出力（デフォルト: false）
+
+    書き込み専用シート（StreamedWorksheet）はセルを読み返せないため、書き出した範囲だけを出力し、
+    列ごとの統計情報の対象外になります。
     """
 
+    # 処理日時を出力するため、キャッシュした結果では日時が古くなる
+    cacheable = False
+
+    def reads_sheets(self, sheetnames):
+        # 各シートの使用範囲しか参照しない
+        return []
+
+    def writes_sheets(self, sheetnames):
+        return [self.config.get('sheet_name', 'Summary')]
+
     def process(self, workbook: Workbook, file_path: str) -> Workbook:
         sheet_name = self.config.get('sheet_name', 'Summary')
         position = self.config.get('position', 0)
+        column_stats = self.config.get('column_stats', False)
 
         self.log(f"Adding summary sheet: {sheet_name}")
 
@@ -55,14 +72,48 @@ class SummarySheetProcessor(BaseSheetProcessor):
             if sheet_name != self.config.get('sheet_name', 'Summary'):
                 summary_sheet[f'A{row}'] = f"{idx - 1}. {sheet_name}"
 
-                # シートの行数と列数を取得
+                # シートの行数と列数を取得（統計情報を出力する場合は値が入っている範囲）
                 ws = workbook[sheet_name]
-                summary_sheet[f'B{row}'] = f"Rows: {ws.max_row}, Cols: {ws.max_column}"
+                if column_stats and not is_streamed(ws):
+                    stats = self.sheet_stats(workbook, sheet_name)
+                    summary_sheet[f'B{row}'] = f"Rows: {stats.max_row}, Cols: {stats.max_column}"
+                elif is_streamed(ws):
+                    summary_sheet[f'B{row}'] = f"Rows: {ws.max_row}, Cols: {ws.max_column} (write-only)"
+                else:
+                    summary_sheet[f'B{row}'] = f"Rows: {ws.max_row}, Cols: {ws.max_column}"
                 row += 1
 
+        if column_stats:
+            row = self._write_column_stats(workbook, summary_sheet, row + 1)
+
         # 列幅を調整
         summary_sheet.column_dimensions['A'].width = 25
         summary_sheet.column_dimensions['B'].width = 40
 
         self.log("Summary sheet added successfully")
         return workbook
+
+    def _write_column_stats(self, workbook: Workbook, summary_sheet, row: int) -> int:
+        """シートごとに列の統計情報の表を出力し、次の行番号を返す"""
+        summary_sheet[f'A{row}'] = "Column Statistics:"
+        summary_sheet[f'A{row}'].font = Font(bold=True)
+        row += 1
+
+        labels = ["Sheet", "Column", "Type", "Count", "Min", "Max", "Sum"]
+        for column, label in enumerate(labels, 1):
+            cell = summary_sheet.cell(row, column, label)
+            cell.font = Font(bold=True)
+        row += 1
+
+        for sheet_name in workbook.sheetnames:
+            # 書き込み専用シートはセルを読み返せないため、統計情報を計算できない
+            if sheet_name == summary_sheet.title or is_streamed(workbook[sheet_name]):
+                continue
+            for column in self.sheet_stats(workbook, sheet_name).columns:
+                header = column.header if column.header is not None else get_column_letter(column.column)
+                values = [sheet_name, str(header), column.dtype, column.count, column.min, column.max, column.sum]
+                for index, value in enumerate(values, 1):
+                    summary_sheet.cell(row, index, value)
+                row += 1
+
+        return row
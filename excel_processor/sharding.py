@@ -0,0 +1,222 @@
+"""入力ファイルのシャーディング - CIのジョブ行列で入力を決定的に分割し、結果を1つの出力ディレクトリにまとめる"""
+
+import hashlib
+import json
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .journal import JOURNAL_FILE
+
+# 分割方法: size=ファイルサイズで各シャードの合計サイズが均等になるように詰める, hash=ファイル名のハッシュ値で振り分ける
+SHARD_STRATEGIES = ("size", "hash")
+
+# シャードごとのマニフェスト（shard-2-of-4.json など）と、まとめた結果のマニフェスト
+MANIFEST_PATTERN = "shard-*-of-*.json"
+MERGED_MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    入力ファイル全体のうち、このジョブが担当する部分
+
+    同じ入力ファイルの集合に対しては、どのジョブで計算しても同じ分割になります。
+    """
+
+    index: int  # 1始まりのシャード番号
+    count: int  # シャード数
+    strategy: str = "size"
+
+    def __post_init__(self):
+        if self.count < 1 or not 1 <= self.index <= self.count:
+            raise ValueError(f"Invalid shard: {self.index}/{self.count} (expected 1 <= INDEX <= COUNT)")
+        if self.strategy not in SHARD_STRATEGIES:
+            raise ValueError(
+                f"Unknown shard strategy: {self.strategy} (expected one of: {', '.join(SHARD_STRATEGIES)})"
+            )
+
+    @classmethod
+    def parse(cls, text: str, strategy: str = "size") -> "Shard":
+        """"INDEX/COUNT" 形式（例: "2/4"）の文字列から作成"""
+        try:
+            index, count = (int(part) for part in text.split("/"))
+        except ValueError:
+            raise ValueError(f"Invalid shard: {text} (expected INDEX/COUNT, e.g. 2/4)") from None
+        return cls(index, count, strategy)
+
+    @property
+    def name(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+    def select(self, files: Sequence[Path]) -> List[Path]:
+        """
+        このシャードが担当するファイルを選択
+
+        Args:
+            files: 全シャード共通の入力ファイル
+
+        Returns:
+            担当するファイル（ファイル名順）
+        """
+        if self.strategy == "hash":
+            selected = [f for f in files if _hash_bucket(f.name, self.count) == self.index - 1]
+        else:
+            selected = _pack_by_size(files, self.count)[self.index - 1]
+        return sorted(selected, key=lambda f: f.name)
+
+
+def _hash_bucket(name: str, count: int) -> int:
+    """ファイル名の安定したハッシュ値（Python の hash() は実行ごとに変わるため SHA-1 を使う）"""
+    digest = hashlib.sha1(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def _pack_by_size(files: Sequence[Path], count: int) -> List[List[Path]]:
+    """
+    大きいファイルから順に、合計サイズが最も小さいシャードへ割り当てる
+
+    サイズが同じ場合はファイル名順、合計が同じ場合はシャード番号の小さい方に割り当てるため、決定的になります。
+    """
+    bins: List[List[Path]] = [[] for _ in range(count)]
+    totals = [0] * count
+    for size, name, f in sorted(((f.stat().st_size, f.name, f) for f in files), key=lambda item: (-item[0], item[1])):
+        target = min(range(count), key=lambda i: (totals[i], i))
+        bins[target].append(f)
+        totals[target] += size
+    return bins
+
+
+def read_file_list(path: Path) -> List[str]:
+    """
+    処理するファイルの一覧を読み込む（1行に1ファイル、空行と # で始まる行は無視）
+
+    パスで書かれていてもファイル名だけを使うため、``git diff --name-only`` の出力をそのまま渡せます。
+    """
+    names = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            names.append(Path(line).name)
+    return names
+
+
+def write_manifest(
+    output_dir: Path,
+    shard: Shard,
+    processed: Sequence[Path],
+    failures: Sequence[Tuple[Path, BaseException]]
+) -> Path:
+    """
+    シャードの処理結果をマニフェストとして出力ディレクトリに書き出す
+
+    Args:
+        output_dir: シャードの出力ディレクトリ
+        shard: 処理したシャード
+        processed: このシャードが担当した入力ファイル
+        failures: 失敗したファイルと例外
+
+    Returns:
+        マニフェストのパス
+    """
+    errors = {input_file.name: f"{error.__class__.__name__}: {error}" for input_file, error in failures}
+    manifest = {
+        'shard': shard.index,
+        'count': shard.count,
+        'strategy': shard.strategy,
+        'finished_at': datetime.now().isoformat(timespec="seconds"),
+        'files': [
+            {
+                'input': input_file.name,
+                'status': 'failed' if input_file.name in errors else 'saved',
+                **({'error': errors[input_file.name]} if input_file.name in errors else {}),
+            }
+            for input_file in processed
+        ],
+    }
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = output_dir / f"{shard.name}.json"
+    manifest_file.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest_file
+
+
+def merge_shards(
+    shard_dirs: Sequence[Path],
+    output_base_dir: Path,
+    input_dir: Optional[Path] = None
+) -> Tuple[Path, List[Dict[str, Any]]]:
+    """
+    各シャードの出力ディレクトリを、1つのタイムスタンプ付きディレクトリにまとめる
+
+    ``shard_dirs`` 以下からシャードのマニフェストを探し、全シャードが揃っていることを確認してから
+    出力ファイルをコピーします。``input_dir`` を指定すると、処理に成功した入力ファイルをそこから削除します
+    （各シャードのジョブで削除した入力ファイルを、まとめるジョブのチェックアウトにも反映するため）。
+
+    Args:
+        shard_dirs: シャードの出力（アーティファクト）を置いたディレクトリ
+        output_base_dir: まとめた結果を作成するディレクトリ（この下に YYYY-MM-DD_HHMMSS を作成）
+        input_dir: 処理に成功した入力ファイルを削除するディレクトリ
+
+    Returns:
+        (まとめた出力ディレクトリ, 失敗したファイルのエントリー)
+    """
+    manifests: Dict[int, Tuple[Path, Dict[str, Any]]] = {}
+    counts = set()
+    for shard_dir in shard_dirs:
+        for manifest_file in sorted(Path(shard_dir).rglob(MANIFEST_PATTERN)):
+            manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            if manifest['shard'] in manifests:
+                raise ValueError(
+                    f"Duplicate manifest for shard {manifest['shard']}: "
+                    f"{manifests[manifest['shard']][0]} and {manifest_file}"
+                )
+            manifests[manifest['shard']] = (manifest_file, manifest)
+            counts.add(manifest['count'])
+
+    if not manifests:
+        raise ValueError(f"No shard manifests found in: {', '.join(str(d) for d in shard_dirs)}")
+    if len(counts) != 1:
+        raise ValueError(f"Shard manifests disagree on the shard count: {sorted(counts)}")
+    count = counts.pop()
+    missing = [index for index in range(1, count + 1) if index not in manifests]
+    if missing:
+        raise ValueError(f"Missing shard manifests: {', '.join(f'{index}/{count}' for index in missing)}")
+
+    output_dir = output_base_dir / datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    for index in sorted(manifests):
+        manifest_file, manifest = manifests[index]
+        _copy_outputs(manifest_file.parent, output_dir)
+        files.extend({**entry, 'shard': index} for entry in manifest['files'])
+
+    merged = {'count': count, 'merged_at': datetime.now().isoformat(timespec="seconds"), 'files': files}
+    (output_dir / MERGED_MANIFEST).write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if input_dir is not None:
+        for entry in files:
+            input_file = Path(input_dir) / entry['input']
+            if entry['status'] == 'saved' and input_file.exists():
+                input_file.unlink()
+
+    failures = [entry for entry in files if entry['status'] == 'failed']
+    return output_dir, failures
+
+
+def _copy_outputs(shard_output_dir: Path, output_dir: Path):
+    """シャードの出力ファイルをコピー（マニフェスト・ジャーナルを除く、同じ名前のファイルが既にあればエラー）"""
+    for source in sorted(shard_output_dir.rglob("*")):
+        if source.is_dir() or (
+            source.parent == shard_output_dir
+            and (source.match(MANIFEST_PATTERN) or source.name == JOURNAL_FILE)
+        ):
+            continue
+        target = output_dir / source.relative_to(shard_output_dir)
+        if target.exists():
+            raise ValueError(f"Output file produced by more than one shard: {target.relative_to(output_dir)}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
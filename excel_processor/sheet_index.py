@@ -0,0 +1,200 @@
+"""シート統計インデックス - 使用範囲・ヘッダー行・列の型・数値の集計をワークブックごとに1回だけ計算して共有"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import openpyxl
+from openpyxl.workbook import Workbook
+
+from .passthrough import SheetPassthrough
+from .streamed_sheet import is_streamed
+
+# 列の型の表示名（bool は int のサブクラスなので type() で判定する）
+_TYPE_NAMES = {
+    int: 'int',
+    float: 'float',
+    str: 'str',
+    bool: 'bool',
+    datetime: 'datetime',
+    date: 'date',
+    time: 'time',
+    timedelta: 'timedelta',
+}
+_NUMERIC_TYPES = (int, float)
+
+
+@dataclass
+class ColumnStats:
+    """1列分の統計情報（ヘッダー行より下のセルが対象）"""
+
+    column: int
+    header: Any = None
+    dtype: str = 'empty'
+    count: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    sum: Optional[float] = None
+
+
+@dataclass
+class SheetStats:
+    """1シート分の統計情報（値が入っているセルの範囲が対象、空のシートは範囲がすべて 0）"""
+
+    title: str
+    min_row: int = 0
+    max_row: int = 0
+    min_column: int = 0
+    max_column: int = 0
+    header_row: Optional[int] = None
+    columns: List[ColumnStats] = field(default_factory=list)
+
+    @property
+    def header(self) -> List[Any]:
+        return [column.header for column in self.columns]
+
+    @property
+    def data_rows(self) -> int:
+        """ヘッダー行より下の行数"""
+        return self.max_row - self.header_row if self.header_row else 0
+
+
+class _ColumnAccumulator:
+    """1列分の値を1回の走査で集計"""
+
+    __slots__ = ('types', 'count', 'min', 'max', 'sum')
+
+    def __init__(self):
+        self.types = {}
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.sum = None
+
+    def add(self, value):
+        value_type = type(value)
+        self.types[value_type] = self.types.get(value_type, 0) + 1
+        self.count += 1
+        if value_type in _NUMERIC_TYPES:
+            if self.sum is None:
+                self.min = self.max = self.sum = value
+            else:
+                self.sum += value
+                if value < self.min:
+                    self.min = value
+                elif value > self.max:
+                    self.max = value
+
+    def dtype(self) -> str:
+        if not self.types:
+            return 'empty'
+        if len(self.types) == 1:
+            value_type = next(iter(self.types))
+            return _TYPE_NAMES.get(value_type, value_type.__name__)
+        if set(self.types) <= set(_NUMERIC_TYPES):
+            return 'float'
+        return 'mixed'
+
+
+def compute_sheet_stats(title: str, rows: Iterable[Tuple[Any, ...]]) -> SheetStats:
+    """
+    1行1列目から並ぶセル値のタプルを1回走査して統計情報を計算
+
+    値が入っている最初の行をヘッダー行とし、それより下の行を列ごとに集計します。
+
+    Args:
+        title: シート名
+        rows: セル値のタプル（1行目から順に）
+
+    Returns:
+        SheetStats
+    """
+    stats = SheetStats(title)
+    header: List[Any] = []
+    accumulators: List[_ColumnAccumulator] = []
+
+    for row_index, row in enumerate(rows, 1):
+        filled = [column for column, value in enumerate(row, 1) if value is not None]
+        if not filled:
+            continue
+
+        if stats.header_row is None:
+            stats.header_row = stats.min_row = row_index
+            stats.min_column, stats.max_column = filled[0], filled[-1]
+            header = list(row)
+        else:
+            stats.min_column = min(stats.min_column, filled[0])
+            stats.max_column = max(stats.max_column, filled[-1])
+            if len(accumulators) < filled[-1]:
+                accumulators.extend(_ColumnAccumulator() for _ in range(filled[-1] - len(accumulators)))
+            for column in filled:
+                accumulators[column - 1].add(row[column - 1])
+        stats.max_row = row_index
+
+    for column in range(stats.min_column, stats.max_column + 1) if stats.header_row else ():
+        column_stats = ColumnStats(column, header[column - 1] if column <= len(header) else None)
+        if column <= len(accumulators):
+            accumulator = accumulators[column - 1]
+            column_stats.dtype = accumulator.dtype()
+            column_stats.count = accumulator.count
+            column_stats.min, column_stats.max, column_stats.sum = accumulator.min, accumulator.max, accumulator.sum
+        stats.columns.append(column_stats)
+
+    return stats
+
+
+class SheetIndex:
+    """
+    ワークブックのシート統計情報を、初めて参照された時に計算してキャッシュするクラス
+
+    ExcelProcessor がファイルごとに1つ作成し、全プロセッサーで共有します。
+    プロセッサーが ``writes_sheets`` で宣言したシートは、そのプロセッサーの実行後に再計算されます。
+    解析を省略したシートは、入力ファイルから read_only モードで値を読み込んで計算します。
+    """
+
+    def __init__(self, workbook: Workbook, passthrough: Optional[SheetPassthrough] = None):
+        """
+        Args:
+            workbook: 対象のWorkbook
+            passthrough: 解析を省略したシートの情報
+        """
+        self.workbook = workbook
+        self.passthrough = passthrough
+        # シート名 -> (計算時のWorksheet, 統計情報)
+        self._cache: Dict[str, Tuple[Any, SheetStats]] = {}
+
+    def stats(self, sheet_name: str) -> SheetStats:
+        """シートの統計情報（キャッシュ済みで、シートが作り直されていなければ再計算しない）"""
+        ws = self.workbook[sheet_name]
+        cached = self._cache.get(sheet_name)
+        if cached is not None and cached[0] is ws:
+            return cached[1]
+
+        if is_streamed(ws):
+            raise ValueError(f"Sheet '{sheet_name}' is write-only and its statistics cannot be computed")
+
+        source_name = self.passthrough.source_sheet(ws) if self.passthrough is not None else None
+        if source_name is not None:
+            source = openpyxl.load_workbook(self.passthrough.input_file, read_only=True)
+            try:
+                stats = compute_sheet_stats(ws.title, source[source_name].iter_rows(values_only=True))
+            finally:
+                source.close()
+        else:
+            stats = compute_sheet_stats(ws.title, ws.iter_rows(min_row=1, min_col=1, values_only=True))
+
+        self._cache[sheet_name] = (ws, stats)
+        return stats
+
+    def invalidate(self, sheet_names: Optional[Iterable[str]] = None):
+        """
+        統計情報のキャッシュを破棄
+
+        Args:
+            sheet_names: 破棄するシート名（None の場合は全シート）
+        """
+        if sheet_names is None:
+            self._cache.clear()
+            return
+        for sheet_name in sheet_names:
+            self._cache.pop(sheet_name, None)
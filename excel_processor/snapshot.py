@@ -0,0 +1,215 @@
+"""開発用スナップショット - ノートブックでの試行ごとに同じ入力ファイルを解析し直さないためのキャッシュ"""
+
+import gc
+import hashlib
+import pickle
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import openpyxl
+from openpyxl.workbook import Workbook
+
+from .output import OutputWriter, atomic_output
+from .streamed_sheet import is_streamed
+
+# スナップショットの保存先（None を指定するとメモリ上だけに保持）
+SNAPSHOT_DIR = ".cache/snapshots"
+# 保存形式を変えた時に古いスナップショットを使わないためのバージョン
+_FORMAT_VERSION = 1
+
+
+@contextmanager
+def _gc_paused():
+    """大量のオブジェクトを作る pickle の読み書き中は GC を止める（数倍速くなる）"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def sheet_fingerprint(ws) -> str:
+    """
+    シートの内容（セルの値・型・スタイル、結合セル、列幅・行の高さなど）のハッシュ値
+
+    プレビューに変更されたシートだけを保存するための簡易的な比較に使います。
+    印刷設定・図・グラフなどの変更は検出しません。
+    """
+    if is_streamed(ws):
+        return ""
+    # 参照しただけで作られる空のセル（値もスタイルもない）は無視する
+    cells = [(key, cell) for key, cell in ws._cells.items() if cell._value is not None or cell.has_style]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(ws.title.encode("utf-8"))
+    h.update(repr([(key, cell._value, cell.data_type) for key, cell in cells]).encode("utf-8"))
+    h.update(b"".join([cell._style.tobytes() for _, cell in cells if cell._style is not None]))
+    h.update(repr((
+        sorted(str(cell_range) for cell_range in ws.merged_cells.ranges),
+        sorted((key, dim.width, dim.hidden) for key, dim in ws.column_dimensions.items()),
+        sorted((key, dim.height, dim.hidden) for key, dim in ws.row_dimensions.items()),
+        ws.freeze_panes,
+        ws.auto_filter.ref,
+        ws.sheet_state,
+        len(ws.conditional_formatting),
+        len(ws.data_validations.dataValidation),
+    )).encode("utf-8"))
+    return h.hexdigest()
+
+
+class WorkbookSnapshot:
+    """
+    入力ファイルを解析した結果（ベースライン）を保持し、試行ごとにそのコピーを渡すクラス
+
+    ベースラインは pickle したバイト列としてメモリに保持し、``cache_dir`` にも保存します。
+    入力ファイルのサイズ・更新時刻が変わらなければ、カーネルを再起動した後もディスクから読み込むため、
+    ``openpyxl.load_workbook`` による解析は初回だけになります。
+
+    Example:
+        snapshot = get_snapshot("input/large.xlsx")
+        wb = snapshot.copy()          # 試行ごとに新しいコピー（ベースラインは変わらない）
+        wb = MyProcessor(config).process(wb, "input/large.xlsx")
+        snapshot.changed_sheets(wb)   # ベースラインから変わったシート
+    """
+
+    def __init__(self, path, cache_dir: Optional[str] = SNAPSHOT_DIR):
+        """
+        Args:
+            path: 入力ファイル
+            cache_dir: スナップショットの保存先（None の場合はメモリ上だけに保持）
+        """
+        self.path = Path(path).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._blob: Optional[bytes] = None
+        self._key = None
+        self._fingerprints: Dict[str, str] = {}
+
+    @property
+    def snapshot_file(self) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha1(str(self.path).encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{self.path.stem}.{digest}.snapshot"
+
+    def copy(self) -> Workbook:
+        """ベースラインのコピーを返す（入力ファイルが更新されていれば解析し直す）"""
+        self._ensure_current()
+        with _gc_paused():
+            return pickle.loads(self._blob)
+
+    def changed_sheets(self, workbook: Workbook) -> List[str]:
+        """
+        ベースラインから変更・追加されたシート名（ワークブックのシート順）
+
+        書き込み専用シート（StreamedWorksheet）は常に変更されたものとみなします。
+        """
+        self._ensure_current()
+        return [
+            ws.title for ws in workbook.worksheets
+            if is_streamed(ws) or self._fingerprints.get(ws.title) != sheet_fingerprint(ws)
+        ]
+
+    def _current_key(self):
+        stat = self.path.stat()
+        return {
+            'format': _FORMAT_VERSION,
+            'openpyxl': openpyxl.__version__,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+
+    def _ensure_current(self):
+        try:
+            key = self._current_key()
+        except FileNotFoundError:
+            # 入力ファイルが移動・削除されても、読み込み済みのベースラインは使い続ける
+            if self._blob is not None:
+                return
+            raise
+        if self._blob is not None and self._key == key:
+            return
+        if not self._read_snapshot(key):
+            self._build(key)
+
+    def _read_snapshot(self, key) -> bool:
+        """ディスクのスナップショットが入力ファイルと一致すれば読み込む"""
+        snapshot_file = self.snapshot_file
+        if snapshot_file is None or not snapshot_file.exists():
+            return False
+        try:
+            with open(snapshot_file, "rb") as f:
+                meta = pickle.load(f)
+                if meta.get('key') != key:
+                    return False
+                blob = f.read()
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+
+        self._blob, self._key, self._fingerprints = blob, key, meta['fingerprints']
+        print(f"Snapshot loaded: {self.path.name} ({len(blob) / (1024 * 1024):.1f} MB)")
+        return True
+
+    def _build(self, key):
+        """入力ファイルを解析してベースラインを作成し、ディスクに保存"""
+        print(f"Parsing baseline: {self.path.name}")
+        workbook = openpyxl.load_workbook(self.path)
+        with _gc_paused():
+            blob = pickle.dumps(workbook, protocol=pickle.HIGHEST_PROTOCOL)
+            fingerprints = {ws.title: sheet_fingerprint(ws) for ws in workbook.worksheets}
+        self._blob, self._key, self._fingerprints = blob, key, fingerprints
+
+        snapshot_file = self.snapshot_file
+        if snapshot_file is None:
+            return
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_output(snapshot_file) as tmp_file:
+            with open(tmp_file, "wb") as f:
+                pickle.dump({'key': key, 'fingerprints': fingerprints}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.write(blob)
+        print(f"Snapshot saved: {snapshot_file}")
+
+
+# 入力ファイル（絶対パス）-> スナップショット（ノートブックのセルをまたいで使い回す）
+_snapshots: Dict[Path, WorkbookSnapshot] = {}
+
+
+def get_snapshot(path, cache_dir: Optional[str] = SNAPSHOT_DIR) -> WorkbookSnapshot:
+    """
+    入力ファイルのスナップショットを取得（同じファイルには同じオブジェクトを返す）
+
+    Args:
+        path: 入力ファイル
+        cache_dir: スナップショットの保存先（None の場合はメモリ上だけに保持）
+    """
+    resolved = Path(path).resolve()
+    snapshot = _snapshots.get(resolved)
+    if snapshot is None:
+        snapshot = _snapshots[resolved] = WorkbookSnapshot(resolved, cache_dir)
+    return snapshot
+
+
+def save_sheets(workbook: Workbook, sheets: List[str], output_file, writer: Optional[OutputWriter] = None):
+    """
+    ワークブックのうち指定したシートだけを保存（ワークブック自体は変更しない）
+
+    Args:
+        workbook: 保存するWorkbook
+        sheets: 保存するシート名
+        output_file: 保存先
+        writer: 圧縮方式（None の場合は openpyxl と同じ設定）
+    """
+    writer = writer or OutputWriter()
+    selected = set(sheets)
+    all_sheets = workbook._sheets
+    active_index = workbook._active_sheet_index
+    active = all_sheets[active_index] if 0 <= active_index < len(all_sheets) else None
+
+    workbook._sheets = [ws for ws in all_sheets if ws.title in selected]
+    workbook._active_sheet_index = workbook._sheets.index(active) if active in workbook._sheets else 0
+    try:
+        writer.save(workbook, output_file)
+    finally:
+        workbook._sheets = all_sheets
+        workbook._active_sheet_index = active_index
@@ -0,0 +1,111 @@
+"""書き込み専用シート - 通常のワークブックに、行を上から順に一時ファイルへ書き出すシートを追加"""
+
+import os
+from typing import Optional
+
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.workbook import Workbook
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+
+class StreamedWorksheet(WriteOnlyWorksheet):
+    """
+    通常の（write_only ではない）ワークブックに追加できる書き込み専用シート
+
+    ``append`` した行はすぐに一時ファイルへ書き出され、セルはメモリに残りません。
+    数十万行を超えるシートを生成するプロセッサー向けです。
+
+    - 保存は OutputWriter（ExcelProcessor の保存処理、``utils.save_preview``）で行う必要があります
+    - セルを読み返すことはできないため、後続の CellVisitorProcessor の走査や ``sheet_stats`` の対象外になります
+    - 列幅・行の高さ・条件付き書式などのシート設定は、最初の行を追加する前に行ってください
+    """
+
+    @property
+    def max_row(self) -> int:
+        """書き出した行数"""
+        return self._max_row
+
+    @property
+    def max_column(self) -> int:
+        """書き出した行の最大の列数"""
+        return self._max_col
+
+    def append(self, row):
+        if not isinstance(row, (list, tuple, range)):
+            row = list(row)
+        super().append(row)
+        self._max_row += 1
+        if len(row) > self._max_col:
+            self._max_col = len(row)
+
+    def _values_to_row(self, values, row_idx):
+        # 書式を設定済みの Cell はそのまま書き出す（値の変換に失敗した時の例外処理を通さない）
+        cell = WriteOnlyCell(self)
+        for col_idx, value in enumerate(values, 1):
+            if value is None:
+                continue
+            if isinstance(value, Cell):
+                value.column = col_idx
+                value.row = row_idx
+                yield value
+                continue
+
+            cell.value = value
+            cell.column = col_idx
+            cell.row = row_idx
+            if cell.hyperlink is not None:
+                cell.hyperlink.ref = cell.coordinate
+            yield cell
+
+            if cell.has_style or cell.hyperlink:
+                cell = WriteOnlyCell(self)
+
+
+def create_streamed_sheet(workbook: Workbook, title: str, index: Optional[int] = None) -> StreamedWorksheet:
+    """
+    書き込み専用シートを作成してワークブックに追加
+
+    Args:
+        workbook: 追加先のWorkbook（write_only でなくてもよい）
+        title: シート名
+        index: シートの挿入位置（Noneの場合は最後に追加）
+
+    Returns:
+        作成したStreamedWorksheet
+    """
+    ws = StreamedWorksheet(workbook, title)
+    workbook._add_sheet(ws, index)
+    return ws
+
+
+def is_streamed(ws) -> bool:
+    """セルを読み返せない書き込み専用シートかどうか"""
+    return isinstance(ws, WriteOnlyWorksheet)
+
+
+def discard_streamed_sheets(workbook: Optional[Workbook]):
+    """
+    保存せずに破棄するワークブックの書き込み専用シートを閉じ、一時ファイルを削除
+
+    処理・保存に失敗した時に呼びます。閉じないまま破棄すると一時ファイルが残り、
+    ガベージコレクションの時に "Exception ignored ... I/O operation on closed file" が出力されます。
+    保存済みのシート（一時ファイルを削除済み）は何もしません。
+    """
+    if workbook is None:
+        return
+    for ws in workbook.worksheets:
+        writer = ws._writer if is_streamed(ws) else None
+        if writer is None or not os.path.exists(writer.out):
+            continue
+        try:
+            if not ws.closed:
+                ws.close()
+        except Exception:
+            # 行の書き込み途中で失敗したシートは閉じられないため、書き込み中のジェネレーターだけを止める
+            for generator in (ws._rows, writer.xf):
+                try:
+                    if generator is not None:
+                        generator.close()
+                except Exception:
+                    pass
+        writer.cleanup()
@@ -0,0 +1,142 @@
+"""処理のトレース - 処理時間・CPU時間・セル数・メモリをスパン単位で記録"""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Span:
+    """1つの処理区間の計測結果"""
+
+    def __init__(self, name: str, depth: int, parent: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.depth = depth
+        self.parent = parent
+        self.attrs = attrs
+        self.cells: Optional[int] = None
+        self.start = 0.0
+        self.wall_sec = 0.0
+        self.cpu_sec = 0.0
+        self.peak_bytes: Optional[int] = None
+
+    def add_cells(self, count: int):
+        """この区間で扱ったセル数を加算"""
+        self.cells = (self.cells or 0) + count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'parent': self.parent,
+            'depth': self.depth,
+            'start_sec': round(self.start, 6),
+            'wall_sec': round(self.wall_sec, 6),
+            'cpu_sec': round(self.cpu_sec, 6),
+            'cells': self.cells,
+            'peak_mb': round(self.peak_bytes / (1024 * 1024), 3) if self.peak_bytes is not None else None,
+            **self.attrs,
+        }
+
+
+class _NullSpan:
+    """トレース無効時に使う何もしないスパン"""
+
+    def add_cells(self, count: int):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    入れ子にできるスパンを記録し、JSON Lines と Chrome トレース形式で出力するクラス
+
+    ``trace_memory=True`` の場合は tracemalloc でスパンごとのピークメモリも記録します
+    （計測のオーバーヘッドが大きいため、必要な場合のみ有効にしてください）。
+    """
+
+    def __init__(self, trace_memory: bool = False, **attrs):
+        """
+        Args:
+            trace_memory: ピークメモリを記録するか
+            attrs: 全スパンに付与する属性（ファイル名など）
+        """
+        self.trace_memory = trace_memory
+        self.attrs = attrs
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._origin = time.perf_counter()
+
+    @property
+    def current(self) -> Optional[Span]:
+        """計測中の最も内側のスパン"""
+        return self._stack[-1] if self._stack else None
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        """処理区間を計測するコンテキストマネージャー"""
+        parent = self._stack[-1] if self._stack else None
+        span = Span(name, len(self._stack), parent.name if parent else None, {**self.attrs, **attrs})
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            # 親スパンのピークを確定させてからリセットし、この区間のピークを測る
+            current_peak = tracemalloc.get_traced_memory()[1]
+            for open_span in self._stack:
+                open_span.peak_bytes = max(open_span.peak_bytes or 0, current_peak)
+            tracemalloc.reset_peak()
+
+        self._stack.append(span)
+        span.start = time.perf_counter() - self._origin
+        cpu_start = time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_sec = time.perf_counter() - self._origin - span.start
+            span.cpu_sec = time.process_time() - cpu_start
+            self._stack.pop()
+
+            if self.trace_memory:
+                span.peak_bytes = max(span.peak_bytes or 0, tracemalloc.get_traced_memory()[1])
+                if parent is not None:
+                    parent.peak_bytes = max(parent.peak_bytes or 0, span.peak_bytes)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            self.spans.append(span)
+
+    def write_jsonl(self, path: Path):
+        """スパンを1行1JSONで出力"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in sorted(self.spans, key=lambda s: s.start):
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+    def write_chrome_trace(self, path: Path):
+        """chrome://tracing や Perfetto で開ける Chrome トレース形式で出力"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        events = []
+        for span in sorted(self.spans, key=lambda s: s.start):
+            args = span.to_dict()
+            for key in ('name', 'parent', 'depth', 'start_sec', 'wall_sec'):
+                args.pop(key)
+            events.append({
+                'name': span.name,
+                'cat': span.name.split(':')[0],
+                'ph': 'X',
+                'ts': round(span.start * 1_000_000, 1),
+                'dur': round(span.wall_sec * 1_000_000, 1),
+                'pid': pid,
+                'tid': 0,
+                'args': args,
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False, default=str)
@@ -1,14 +1,19 @@
 """ヘルパー関数とユーティリティ"""
 
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 import openpyxl
 from openpyxl.workbook import Workbook
 
+from .output import OutputWriter
+from .peek import WorkbookPeek
+from .snapshot import get_snapshot, save_sheets
+
 
 def load_excel_from_input(
     file_name: Optional[str] = None,
-    input_dir: str = "input"
+    input_dir: str = "input",
+    snapshot: bool = False
 ) -> tuple[Workbook, Path]:
     """
     inputディレクトリからExcelファイルを読み込む
@@ -16,6 +21,8 @@ def load_excel_from_input(
     Args:
         file_name: ファイル名（Noneの場合は最初のファイル）
         input_dir: 入力ディレクトリ
+        snapshot: 解析結果をスナップショットとしてキャッシュし、そのコピーを返す
+            （2回目以降は解析せずにコピーするだけ。ファイルが更新されると解析し直す）
 
     Returns:
         (Workbook, Path): ワークブックオブジェクトとファイルパス
@@ -24,6 +31,51 @@ def load_excel_from_input(
         FileNotFoundError: ファイルが見つからない場合
         ValueError: Excelファイルが存在しない場合
     """
+    target_file = _select_input_file(file_name, input_dir)
+
+    # ワークブックを読み込み
+    if snapshot:
+        workbook = get_snapshot(target_file).copy()
+    else:
+        workbook = openpyxl.load_workbook(target_file)
+    print(f"Loaded: {target_file.name}")
+    print(f"Sheets: {workbook.sheetnames}")
+
+    return workbook, target_file
+
+
+def peek_excel_from_input(
+    file_name: Optional[str] = None,
+    input_dir: str = "input"
+) -> tuple[WorkbookPeek, Path]:
+    """
+    inputディレクトリのExcelファイルを、ワークブック全体を読み込まずに開く
+
+    シート一覧と各シートのサイズ（<dimension> タグ）だけを読むため、大きなファイルでもすぐに返ります。
+    結果は ``print_sheet_info`` / ``print_sheet_preview`` にそのまま渡せます。
+
+    Args:
+        file_name: ファイル名（Noneの場合は最初のファイル）
+        input_dir: 入力ディレクトリ
+
+    Returns:
+        (WorkbookPeek, Path): 簡易確認用のオブジェクトとファイルパス
+
+    Raises:
+        FileNotFoundError: ファイルが見つからない場合
+        ValueError: Excelファイルが存在しない場合
+    """
+    target_file = _select_input_file(file_name, input_dir)
+
+    peek = WorkbookPeek(target_file)
+    print(f"Peeked: {target_file.name}")
+    print(f"Sheets: {peek.sheetnames}")
+
+    return peek, target_file
+
+
+def _select_input_file(file_name: Optional[str], input_dir: str) -> Path:
+    """inputディレクトリから読み込むファイルを選択（Noneの場合は最初のファイル）"""
     input_path = Path(input_dir)
 
     if not input_path.exists():
@@ -44,12 +96,7 @@ def load_excel_from_input(
         target_file = excel_files[0]
         print(f"Loading first file: {target_file.name}")
 
-    # ワークブックを読み込み
-    workbook = openpyxl.load_workbook(target_file)
-    print(f"Loaded: {target_file.name}")
-    print(f"Sheets: {workbook.sheetnames}")
-
-    return workbook, target_file
+    return target_file
 
 
 def get_excel_files(input_dir: str = "input") -> List[Path]:
@@ -78,8 +125,9 @@ def get_excel_files(input_dir: str = "input") -> List[Path]:
 def save_preview(
     workbook: Workbook,
     original_file: Path,
-    preview_dir: str = "output/preview"
-) -> Path:
+    preview_dir: str = "output/preview",
+    only_changed: bool = False
+) -> Optional[Path]:
     """
     処理結果をプレビュー用に保存
 
@@ -87,38 +135,55 @@ def save_preview(
         workbook: 保存するワークブック
         original_file: 元のファイルパス
         preview_dir: プレビュー保存先ディレクトリ
+        only_changed: 元のファイルのスナップショットから変更・追加されたシートだけを保存
+            （``load_excel_from_input(snapshot=True)`` で読み込んだワークブック向け）
 
     Returns:
-        保存したファイルのパス
+        保存したファイルのパス（only_changed で変更されたシートがない場合は None）
     """
     preview_path = Path(preview_dir)
     preview_path.mkdir(parents=True, exist_ok=True)
 
     preview_file = preview_path / f"preview_{original_file.name}"
-    workbook.save(preview_file)
+    # 書き込み専用シート（StreamedWorksheet）を含むワークブックも保存できるよう OutputWriter で保存する
+    if only_changed:
+        changed = get_snapshot(original_file).changed_sheets(workbook)
+        if not changed:
+            print("No sheets changed; preview not saved.")
+            return None
+        save_sheets(workbook, changed, preview_file, OutputWriter())
+        print(f"Changed sheets: {changed}")
+    else:
+        OutputWriter().save(workbook, preview_file)
 
     print(f"Preview saved: {preview_file}")
     return preview_file
 
 
-def print_sheet_info(workbook: Workbook):
+def print_sheet_info(workbook: Union[Workbook, WorkbookPeek, str, Path]):
     """
     ワークブックのシート情報を出力
 
     Args:
-        workbook: ワークブック
+        workbook: ワークブック、WorkbookPeek、またはExcelファイルのパス
+            （パスの場合はワークブック全体を読み込まずに、<dimension> タグのサイズを表示）
     """
+    if isinstance(workbook, (str, Path)):
+        with WorkbookPeek(workbook) as peek:
+            print_sheet_info(peek)
+        return
+
     print(f"\nTotal sheets: {len(workbook.sheetnames)}")
     print(f"Active sheet: {workbook.active.title}")
     print("\nSheet details:")
 
     for sheet_name in workbook.sheetnames:
         ws = workbook[sheet_name]
-        print(f"  - {sheet_name}: {ws.max_row} rows x {ws.max_column} cols")
+        print(f"  - {sheet_name}: {_format_size(ws)}")
 
 
 def print_sheet_preview(
-    workbook: Workbook,
+    workbook: Union[Workbook, WorkbookPeek, str, Path],
     sheet_name: Optional[str] = None,
     max_rows: int = 10
 ):
@@ -126,10 +191,16 @@ def print_sheet_preview(
     シートの内容をプレビュー表示
 
     Args:
-        workbook: ワークブック
+        workbook: ワークブック、WorkbookPeek、またはExcelファイルのパス
+            （パスの場合はワークブック全体を読み込まずに、先頭の max_rows 行だけを読む）
         sheet_name: シート名（Noneの場合はアクティブシート）
         max_rows: 表示する最大行数
     """
+    if isinstance(workbook, (str, Path)):
+        with WorkbookPeek(workbook) as peek:
+            print_sheet_preview(peek, sheet_name, max_rows)
+        return
+
     if sheet_name:
         if sheet_name not in workbook.sheetnames:
             print(f"Sheet '{sheet_name}' not found")
@@ -139,12 +210,19 @@ def print_sheet_preview(
         ws = workbook.active
 
     print(f"\nSheet: {ws.title}")
-    print(f"Size: {ws.max_row} rows x {ws.max_column} cols")
+    print(f"Size: {_format_size(ws)}")
     print(f"\nFirst {max_rows} rows:")
 
     for row in ws.iter_rows(
         min_row=1,
-        max_row=min(max_rows, ws.max_row),
+        max_row=min(max_rows, ws.max_row) if ws.max_row is not None else max_rows,
         values_only=True
     ):
         print(row)
+
+
+def _format_size(ws) -> str:
+    """シートのサイズ（<dimension> タグがないファイルを WorkbookPeek で開いた場合は不明）"""
+    if ws.max_row is None:
+        return "unknown size (no <dimension> tag)"
+    return f"{ws.max_row} rows x {ws.max_column} cols"
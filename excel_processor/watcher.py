@@ -0,0 +1,174 @@
+"""常駐モード - inputディレクトリを監視し、到着したファイルを順次処理"""
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .core import ExcelProcessor
+
+
+def _warm_up():
+    """ワーカープロセスを起動させておくための空タスク"""
+    return os.getpid()
+
+
+class FolderWatcher:
+    """
+    inputディレクトリをポーリングで監視し、書き込みが完了したファイルを
+    起動済みのワーカープロセスプールで処理するクラス
+
+    ファイルのサイズと更新時刻が2回連続のポーリングで変化しなかった時点で
+    書き込み完了とみなします。検出したファイルはポーリング周期ごとに
+    ``output/YYYY-MM-DD_HHMMSS/`` ディレクトリへまとめて出力されます。
+    """
+
+    def __init__(
+        self,
+        processor: ExcelProcessor,
+        interval: float = 2.0,
+        status_file: Optional[str] = None
+    ):
+        """
+        Args:
+            processor: ファイル処理に使うExcelProcessor
+            interval: ポーリング間隔（秒）
+            status_file: キューの状態を書き出すJSONファイルのパス（Noneの場合は書き出さない）
+        """
+        self.processor = processor
+        self.interval = interval
+        self.status_file = Path(status_file) if status_file else None
+
+        # 書き込み中かどうかを判定するための前回のファイル状態 (size, mtime)
+        self._last_seen: Dict[Path, Tuple[int, float]] = {}
+        # 検出した時刻（レイテンシ計測用）
+        self._detected_at: Dict[Path, float] = {}
+        # 失敗したファイルの状態（内容が変わるまで再処理しない）
+        self._failed: Dict[Path, Tuple[int, float]] = {}
+        self._pending: Dict[Future, Path] = {}
+
+        self.processed = 0
+        self.failed = 0
+        self.last_latency = 0.0
+        self.total_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """処理待ち・処理中のファイル数"""
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        """監視状態の統計情報"""
+        return {
+            'queue_depth': self.queue_depth,
+            'processed': self.processed,
+            'failed': self.failed,
+            'last_latency_sec': round(self.last_latency, 3),
+            'avg_latency_sec': round(self.total_latency / self.processed, 3) if self.processed else 0.0,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def run(self):
+        """Ctrl+C で停止するまで監視を続ける"""
+        workers = self.processor.workers
+        print(f"Watching '{self.processor.input_dir}' every {self.interval}s with {workers} worker(s). Press Ctrl+C to stop.")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # 最初のファイルが届く前にワーカーを起動しておく
+            for future in [executor.submit(_warm_up) for _ in range(workers)]:
+                future.result()
+
+            try:
+                while True:
+                    self._submit_ready_files(executor)
+                    self._write_status()
+
+                    if self._pending:
+                        done, _ = wait(self._pending, timeout=self.interval, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._complete(future)
+                    else:
+                        time.sleep(self.interval)
+            except KeyboardInterrupt:
+                print(f"\nStopping watcher. Waiting for {self.queue_depth} file(s) in progress...")
+                for future in list(self._pending):
+                    future.exception()
+                    self._complete(future)
+                self._write_status()
+
+        print(f"Watcher stopped. Processed: {self.processed}, Failed: {self.failed}")
+
+    def _submit_ready_files(self, executor: ProcessPoolExecutor):
+        """書き込みが完了したファイルをワーカーへ投入"""
+        in_flight = set(self._pending.values())
+        current = {}
+        ready = []
+
+        for input_file in self.processor._find_excel_files():
+            if input_file in in_flight:
+                continue
+            try:
+                stat = input_file.stat()
+            except FileNotFoundError:
+                continue
+
+            signature = (stat.st_size, stat.st_mtime)
+            current[input_file] = signature
+            self._detected_at.setdefault(input_file, time.monotonic())
+
+            if self._failed.get(input_file) == signature:
+                continue
+            if self._last_seen.get(input_file) == signature:
+                ready.append(input_file)
+
+        self._last_seen = current
+        for stale in set(self._detected_at) - set(current) - in_flight:
+            del self._detected_at[stale]
+
+        if not ready:
+            return
+
+        # 到着したファイルをタイムスタンプ付きディレクトリへまとめて出力
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        self.processor.output_dir = self.processor.output_base_dir / timestamp
+        self.processor.output_dir.mkdir(parents=True, exist_ok=True)
+
+        for input_file in ready:
+            self._failed.pop(input_file, None)
+            future = executor.submit(self.processor._process_file, input_file)
+            self._pending[future] = input_file
+        print(f"[watch] Queued {len(ready)} file(s) -> {self.processor.output_dir} (queue: {self.queue_depth})")
+
+    def _complete(self, future: Future):
+        """完了したファイルの結果を記録"""
+        input_file = self._pending.pop(future)
+        latency = time.monotonic() - self._detected_at.pop(input_file, time.monotonic())
+
+        error = future.exception()
+        if error is None:
+            self.processed += 1
+            self.last_latency = latency
+            self.total_latency += latency
+            print(f"[watch] Done: {input_file.name} in {latency:.2f}s (queue: {self.queue_depth})")
+        else:
+            self.failed += 1
+            print(f"[watch] Error processing {input_file.name}: {error}")
+            traceback.print_exception(error)
+            try:
+                stat = input_file.stat()
+                self._failed[input_file] = (stat.st_size, stat.st_mtime)
+            except FileNotFoundError:
+                pass
+
+    def _write_status(self):
+        """統計情報をJSONファイルへ書き出す"""
+        if self.status_file is None:
+            return
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.status_file.with_name(f".{self.status_file.name}.tmp")
+        tmp_file.write_text(json.dumps(self.stats(), ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_file, self.status_file)
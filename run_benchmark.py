@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Excel Processor ベンチマークスクリプト
+
+指定サイズのワークブックを生成し、読み込み・各プロセッサー・保存の処理時間と
+ピークメモリを計測してJSONに記録します（ネットワーク不要）。
+
+    python run_benchmark.py --rows 1000 10000 --cols 10 --sheets 1 3
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+
+import openpyxl
+
+from create_sample_data import create_sized_workbook
+from excel_processor import processors
+
+
+# ベンチマーク時のプロセッサー設定（未指定のプロセッサーは空の設定）
+DEFAULT_PROCESSOR_CONFIGS = {
+    'FormatProcessor': {'exclude_sheets': ['Summary']},
+    'GenerateMazeProcessor': {'height': 101, 'width': 101, 'seed': 0},
+}
+
+
+def measure(setup, run, repeat: int = 1, memory: bool = False) -> dict:
+    """
+    処理時間とピークメモリを計測
+
+    Args:
+        setup: 計測対象に渡す引数を作成する関数（計測対象外）
+        run: 計測対象の関数
+        repeat: 実行回数（最短時間を採用）
+        memory: tracemalloc でピークメモリを計測するか（時間計測とは別に1回実行）
+
+    Returns:
+        wall_sec, cpu_sec, peak_mb を含む辞書
+    """
+    wall_times = []
+    cpu_times = []
+    for _ in range(repeat):
+        arg = setup()
+        gc.collect()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(arg)
+        wall_times.append(time.perf_counter() - wall_start)
+        cpu_times.append(time.process_time() - cpu_start)
+
+    peak_mb = None
+    if memory:
+        arg = setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run(arg)
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'wall_sec': round(min(wall_times), 4),
+        'cpu_sec': round(min(cpu_times), 4),
+        'peak_mb': round(peak_mb, 2) if peak_mb is not None else None,
+    }
+
+
+def benchmark_size(input_file: Path, processor_names, repeat: int, memory: bool) -> list:
+    """1つのワークブックについて、読み込み・各プロセッサー・保存を個別に計測"""
+    results = []
+
+    def load():
+        return openpyxl.load_workbook(input_file)
+
+    results.append({'stage': 'load', **measure(lambda: None, lambda _: load(), repeat, memory)})
+
+    for name in processor_names:
+        processor_class = getattr(processors, name)
+        config = DEFAULT_PROCESSOR_CONFIGS.get(name, {})
+        results.append({
+            'stage': f'process:{name}',
+            **measure(load, lambda wb: processor_class(config).process(wb, str(input_file)), repeat, memory)
+        })
+
+    output_file = input_file.with_name(f"saved_{input_file.name}")
+    results.append({'stage': 'save', **measure(load, lambda wb: wb.save(output_file), repeat, memory)})
+    results[-1]['output_bytes'] = output_file.stat().st_size
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Excel Processor - ベンチマーク')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help='シートあたりの行数（複数指定可）')
+    parser.add_argument('--cols', type=int, nargs='+', default=[10], help='列数（複数指定可）')
+    parser.add_argument('--sheets', type=int, nargs='+', default=[1], help='シート数（複数指定可）')
+    parser.add_argument('--processors', nargs='+', help='計測するプロセッサー名（デフォルト: 全プロセッサー）')
+    parser.add_argument('--maze-size', type=int, help='GenerateMazeProcessor の迷路サイズ（奇数）')
+    parser.add_argument('--repeat', type=int, default=1, help='各計測の実行回数（最短時間を採用）')
+    parser.add_argument('--no-memory', action='store_true', help='ピークメモリを計測しない')
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help='結果のJSONファイル')
+
+    args = parser.parse_args()
+
+    processor_names = args.processors or list(processors.__all__)
+    if args.maze_size:
+        DEFAULT_PROCESSOR_CONFIGS['GenerateMazeProcessor'].update(height=args.maze_size, width=args.maze_size)
+
+    records = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows, cols, sheets in product(args.rows, args.cols, args.sheets):
+            print(f"Benchmark: rows={rows}, cols={cols}, sheets={sheets}")
+            input_file = create_sized_workbook(Path(tmp_dir) / f"bench_{rows}x{cols}x{sheets}.xlsx", rows, cols, sheets)
+
+            for result in benchmark_size(input_file, processor_names, args.repeat, not args.no_memory):
+                record = {'rows': rows, 'cols': cols, 'sheets': sheets, 'input_bytes': input_file.stat().st_size, **result}
+                records.append(record)
+                peak = f"{record['peak_mb']:.1f} MB" if record['peak_mb'] is not None else "-"
+                print(f"  {record['stage']:<32} {record['wall_sec']:>9.3f} s  {peak:>10}")
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'openpyxl': openpyxl.__version__,
+        'processor_configs': {name: DEFAULT_PROCESSOR_CONFIGS.get(name, {}) for name in processor_names},
+        'results': records,
+    }
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
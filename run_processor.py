@@ -7,6 +7,11 @@ from pathlib import Path
 import yaml
 
 from excel_processor import ExcelProcessor
+from excel_processor.cache import ResultCache
+from excel_processor.export import EXPORT_FORMATS, SheetExporter
+from excel_processor.output import OutputWriter
+from excel_processor.sharding import SHARD_STRATEGIES, Shard, merge_shards, read_file_list
+from excel_processor.watcher import FolderWatcher
 from excel_processor import processors
 from excel_processor.base_processor import BaseSheetProcessor
 
@@ -31,6 +36,7 @@ def get_default_config() -> dict:
     return {
         'input_dir': 'input',
         'output_dir': 'output',
+        'workers': 1,
         'processors': [
             {
                 'name': 'SummarySheetProcessor',
@@ -85,6 +91,76 @@ def main():
         '-o', '--output-dir',
         help='出力ディレクトリ（設定ファイルの値を上書き）'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        help='並列処理のプロセス数（0=CPUコア数、設定ファイルの workers を上書き）'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='処理結果キャッシュのディレクトリ（指定するとキャッシュを有効化）'
+    )
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help='処理区間ごとのトレースを出力（設定ファイルの tracing.enabled を上書き）'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='読み込み・処理・保存を重ねて実行するステージパイプラインを使用（設定ファイルの pipeline.enabled を上書き）'
+    )
+    parser.add_argument(
+        '--compression',
+        choices=['store', 'fast', 'default', 'max'],
+        help='出力ファイルの圧縮方式（設定ファイルの output.compression を上書き）'
+    )
+    parser.add_argument(
+        '--export',
+        choices=list(EXPORT_FORMATS),
+        help='処理済みシートを列指向形式でも書き出す（設定ファイルの export.enabled / export.format を上書き）'
+    )
+    parser.add_argument(
+        '--shard',
+        metavar='INDEX/COUNT',
+        help='入力ファイルをCOUNT個に分割し、INDEX番目（1始まり）だけを処理（例: 2/4）'
+    )
+    parser.add_argument(
+        '--shard-strategy',
+        choices=SHARD_STRATEGIES,
+        help='シャードの分割方法（設定ファイルの sharding.strategy を上書き）'
+    )
+    parser.add_argument(
+        '--file-list',
+        metavar='PATH',
+        help='処理するファイル名の一覧（1行に1ファイル）'
+    )
+    parser.add_argument(
+        '--merge',
+        nargs='+',
+        metavar='DIR',
+        help='各シャードの出力ディレクトリを1つの出力ディレクトリにまとめて終了'
+    )
+    parser.add_argument(
+        '--allow-failures',
+        action='store_true',
+        help='--merge と併用: 処理に失敗したファイルがあっても一覧を表示して終了コード0で終了'
+    )
+    parser.add_argument(
+        '--resume',
+        metavar='RUN_DIR',
+        help='中断した実行の出力ディレクトリを指定し、保存済みのファイルを除いて続きから処理'
+    )
+    parser.add_argument(
+        '-w', '--watch',
+        action='store_true',
+        help='常駐モード: inputディレクトリを監視し、到着したファイルを順次処理'
+    )
+    parser.add_argument(
+        '--watch-interval',
+        type=float,
+        help='常駐モードのポーリング間隔（秒、設定ファイルの watch.interval を上書き）'
+    )
 
     args = parser.parse_args()
 
@@ -94,6 +170,47 @@ def main():
     # コマンドライン引数で上書き
     input_dir = args.input_dir or config.get('input_dir', 'input')
     output_dir = args.output_dir or config.get('output_dir', 'output')
+    workers = args.jobs if args.jobs is not None else config.get('workers', 1)
+
+    # シャードの結果をまとめる（プロセッサーは実行しない）
+    if args.merge:
+        try:
+            merged_dir, failures = merge_shards([Path(d) for d in args.merge], Path(output_dir), Path(input_dir))
+        except ValueError as e:
+            print(f"Error merging shards: {e}")
+            sys.exit(1)
+        print(f"Merged shard outputs into: {merged_dir}")
+        if failures:
+            print(f"{len(failures)} file(s) failed:")
+            for entry in failures:
+                print(f"  - {entry['input']} (shard {entry['shard']}): {entry.get('error', '')}")
+            if not args.allow_failures:
+                sys.exit(1)
+        return
+
+    shard = None
+    if args.shard:
+        sharding_config = config.get('sharding') or {}
+        try:
+            shard = Shard.parse(args.shard, args.shard_strategy or sharding_config.get('strategy', 'size'))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    file_list = read_file_list(Path(args.file_list)) if args.file_list else None
+
+    if args.resume and args.watch:
+        print("Error: --resume cannot be used with --watch.")
+        sys.exit(1)
+
+    # 処理結果キャッシュ（オプトイン）
+    cache_config = config.get('cache') or {}
+    cache = None
+    if args.cache_dir or cache_config.get('enabled', False):
+        cache = ResultCache(
+            cache_dir=args.cache_dir or cache_config.get('dir', '.cache/excel_processor'),
+            max_size_mb=cache_config.get('max_size_mb', 1024)
+        )
+        print(f"Result cache: {cache.cache_dir}")
 
     # プロセッサーを作成
     processors = []
@@ -110,6 +227,29 @@ def main():
     if not processors:
         print("Warning: No processors configured. Files will be moved without processing.")
 
+    tracing = dict(config.get('tracing') or {})
+    if args.trace:
+        tracing['enabled'] = True
+
+    output_config = config.get('output') or {}
+    output = OutputWriter(compression=args.compression or output_config.get('compression', 'default'))
+
+    export_config = dict(config.get('export') or {})
+    if args.export:
+        export_config.update(enabled=True, format=args.export)
+    export = None
+    if export_config.get('enabled', False):
+        try:
+            export = SheetExporter(export_config)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Sheet export: {export.format}")
+
+    pipeline = dict(config.get('pipeline') or {})
+    if args.pipeline:
+        pipeline['enabled'] = True
+
     # ExcelProcessorを実行
     print(f"\n{'='*60}")
     print("Excel Processor Starting...")
@@ -118,10 +258,29 @@ def main():
     processor = ExcelProcessor(
         input_dir=input_dir,
         output_dir=output_dir,
-        processors=processors
+        processors=processors,
+        workers=workers,
+        cache=cache,
+        tracing=tracing,
+        sheet_passthrough=config.get('sheet_passthrough', True),
+        pipeline=pipeline,
+        output=output,
+        shard=shard,
+        file_list=file_list,
+        resume_dir=args.resume,
+        export=export
     )
 
-    processor.run()
+    if args.watch:
+        watch_config = config.get('watch') or {}
+        watcher = FolderWatcher(
+            processor,
+            interval=args.watch_interval or watch_config.get('interval', 2.0),
+            status_file=watch_config.get('status_file')
+        )
+        watcher.run()
+    else:
+        processor.run()
 
     print(f"\n{'='*60}")
     print("Excel Processor Completed!")
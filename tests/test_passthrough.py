@@ -0,0 +1,183 @@
+"""SheetPassthrough の往復テスト - 解析を省略したシートが、保存・再読み込み後も元ファイルと同じ内容になるか"""
+
+from datetime import datetime
+from zipfile import ZipFile
+
+import openpyxl
+import pytest
+
+from excel_processor.base_processor import BaseSheetProcessor
+from excel_processor.output import COMPRESSION_LEVELS, OutputWriter
+from excel_processor.passthrough import SheetPassthrough
+
+# 共有文字列表を参照するシートを持つワークブック（openpyxl は文字列をインラインで書き出すため XML を直接作る）
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_SHARED_STRINGS = ["id", "name", "score", "alpha", "beta", "gamma", "共有文字列"]
+
+_PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet2.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        f'<Relationships xmlns="{_PKG_REL_NS}">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+        '<sheet name="Data" sheetId="1" r:id="rId1"/>'
+        '<sheet name="Lookup" sheetId="2" r:id="rId2"/>'
+        '</sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        f'<Relationships xmlns="{_PKG_REL_NS}">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '<Relationship Id="rId2" Target="worksheets/sheet2.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '<Relationship Id="rId3" Target="sharedStrings.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>'
+        '</Relationships>'
+    ),
+    "xl/sharedStrings.xml": (
+        f'<sst xmlns="{_MAIN_NS}" count="{len(_SHARED_STRINGS)}" uniqueCount="{len(_SHARED_STRINGS)}">'
+        + "".join(f"<si><t>{text}</t></si>" for text in _SHARED_STRINGS)
+        + '</sst>'
+    ),
+    "xl/worksheets/sheet1.xml": (
+        f'<worksheet xmlns="{_MAIN_NS}"><dimension ref="A1:C3"/><sheetData>'
+        '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="C1" t="s"><v>2</v></c></row>'
+        '<row r="2"><c r="A2"><v>1</v></c><c r="B2" t="s"><v>3</v></c><c r="C2"><v>0.5</v></c></row>'
+        '<row r="3"><c r="A3"><v>2</v></c><c r="B3" t="s"><v>4</v></c><c r="C3"><v>1.25</v></c></row>'
+        '</sheetData></worksheet>'
+    ),
+    "xl/worksheets/sheet2.xml": (
+        f'<worksheet xmlns="{_MAIN_NS}"><dimension ref="A1:B4"/><sheetData>'
+        '<row r="1"><c r="A1" t="s"><v>1</v></c><c r="B1" t="s"><v>6</v></c></row>'
+        '<row r="2"><c r="A2" t="s"><v>5</v></c><c r="B2"><v>42</v></c></row>'
+        '<row r="4"><c r="A4" t="s"><v>3</v></c><c r="B4" t="b"><v>1</v></c></row>'
+        '</sheetData></worksheet>'
+    ),
+}
+
+
+class _EditDataProcessor(BaseSheetProcessor):
+    """Data シートだけを読み書きするプロセッサー（それ以外のシートは解析が省略される）"""
+
+    def reads_sheets(self, sheetnames):
+        return ["Data"]
+
+    def writes_sheets(self, sheetnames):
+        return ["Data"]
+
+    def process(self, workbook, file_path):
+        workbook["Data"]["D1"] = "total"
+        workbook["Data"]["D2"] = 1.5
+        return workbook
+
+
+def _values(ws):
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+def _round_trip(input_file, output_file, compression="default"):
+    """Data シートだけを処理し、解析を省略したシートをコピーして保存"""
+    processors = [_EditDataProcessor()]
+    passthrough = SheetPassthrough(input_file, processors)
+    workbook = passthrough.load()
+    for processor in processors:
+        workbook = processor.process(workbook, str(input_file))
+    passthrough.save(workbook, output_file, OutputWriter(compression))
+    return passthrough
+
+
+@pytest.fixture
+def shared_strings_workbook(tmp_path):
+    path = tmp_path / "shared.xlsx"
+    with ZipFile(path, "w") as archive:
+        for name, xml in _PARTS.items():
+            archive.writestr(name, xml)
+    return path
+
+
+@pytest.fixture
+def openpyxl_workbook(tmp_path):
+    path = tmp_path / "inline.xlsx"
+    workbook = openpyxl.Workbook()
+    data = workbook.active
+    data.title = "Data"
+    data.append(["id", "name", "score"])
+    data.append([1, "alpha", 0.5])
+    for title in ("Lookup", "History"):
+        ws = workbook.create_sheet(title)
+        ws.append(["key", "value", "updated"])
+        for index in range(1, 51):
+            ws.append([f"{title}-{index}", index * 1.5, datetime(2024, 1, index % 28 + 1, 12, 30)])
+        ws["E60"] = "far cell"
+    workbook.save(path)
+    return path
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSION_LEVELS))
+def test_stubbed_sheets_round_trip_with_shared_strings(shared_strings_workbook, tmp_path, compression):
+    output_file = tmp_path / "out.xlsx"
+    passthrough = _round_trip(shared_strings_workbook, output_file, compression)
+    assert passthrough.sheets == ["Lookup"]
+
+    with ZipFile(output_file) as archive:
+        assert archive.testzip() is None
+        assert "xl/sharedStrings.xml" in archive.namelist()
+
+    source = openpyxl.load_workbook(shared_strings_workbook)
+    result = openpyxl.load_workbook(output_file)
+    assert result.sheetnames == source.sheetnames
+    # コピーしたシートは共有文字列表を参照したまま、元ファイルと同じ値になる
+    assert _values(result["Lookup"]) == _values(source["Lookup"])
+    assert _values(result["Lookup"]) == [["name", "共有文字列"], ["gamma", 42], [None, None], ["alpha", True]]
+
+    expected = _values(source["Data"])
+    expected[0].append("total")
+    expected[1].append(1.5)
+    expected[2].append(None)
+    assert _values(result["Data"]) == expected
+
+
+def test_stubbed_sheets_round_trip_openpyxl_workbook(openpyxl_workbook, tmp_path):
+    output_file = tmp_path / "out.xlsx"
+    passthrough = _round_trip(openpyxl_workbook, output_file)
+    assert passthrough.sheets == ["Lookup", "History"]
+
+    source = openpyxl.load_workbook(openpyxl_workbook)
+    result = openpyxl.load_workbook(output_file)
+    assert result.sheetnames == source.sheetnames
+    for title in ("Lookup", "History"):
+        source_ws, result_ws = source[title], result[title]
+        assert (result_ws.max_row, result_ws.max_column) == (source_ws.max_row, source_ws.max_column)
+        for source_row, result_row in zip(source_ws.iter_rows(), result_ws.iter_rows()):
+            for source_cell, result_cell in zip(source_row, result_row):
+                assert result_cell.value == source_cell.value, source_cell.coordinate
+                assert result_cell.number_format == source_cell.number_format, source_cell.coordinate
+    assert result["Data"]["D1"].value == "total"
+
+
+def test_accessing_stubbed_sheet_cells_is_rejected(openpyxl_workbook, tmp_path):
+    passthrough = SheetPassthrough(openpyxl_workbook, [_EditDataProcessor()])
+    workbook = passthrough.load()
+    # 宣言していないシートのセルを参照すると、空のシートの内容で元の内容を上書きしないよう保存を止める
+    workbook["Lookup"]["A1"].value
+    with pytest.raises(RuntimeError, match="Lookup"):
+        passthrough.save(workbook, tmp_path / "out.xlsx")